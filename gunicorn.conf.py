@@ -0,0 +1,22 @@
+"""Gunicorn configuration for production deployments.
+
+Runs one uvicorn worker per CPU so request handling scales past a single
+GIL. Worker state that matters for routing (the annotator skill-matrix
+cache in SmartTaskRouter) is rebuilt per worker from one two-column query
+and refreshed on a short TTL, so workers need no shared memory.
+"""
+
+import multiprocessing
+
+bind = "0.0.0.0:8000"
+workers = multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Recycle workers periodically to bound any slow leak; jitter avoids all
+# workers restarting at once
+max_requests = 10000
+max_requests_jitter = 1000
+
+graceful_timeout = 30
+timeout = 60
+keepalive = 5
@@ -13,7 +13,7 @@ async def register_annotator(request: AnnotatorRegister, db: Session = Depends(g
     Register a new annotator.
     """
     try:
-        result = await annotator_manager.register_annotator(request.dict())
+        result = await annotator_manager.register_annotator(request.dict(), db)
         
         if not result['success']:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -33,7 +33,7 @@ async def get_annotator_profile(annotator_id: str, db: Session = Depends(get_db)
     Get annotator profile and performance data.
     """
     try:
-        result = await annotator_manager.get_annotator_profile(annotator_id)
+        result = await annotator_manager.get_annotator_profile(annotator_id, db)
         
         if not result['success']:
             raise HTTPException(status_code=404, detail=result['error'])
@@ -56,7 +56,7 @@ async def update_annotator_availability(
     Update annotator availability status.
     """
     try:
-        result = await annotator_manager.update_availability(annotator_id, status)
+        result = await annotator_manager.update_availability(annotator_id, status, db)
         
         if not result['success']:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -81,7 +81,7 @@ async def update_annotator_skills(
     Update annotator skill scores.
     """
     try:
-        result = await annotator_manager.update_skills(annotator_id, skill_updates)
+        result = await annotator_manager.update_skills(annotator_id, skill_updates, db)
         
         if not result['success']:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -117,7 +117,7 @@ async def get_matching_annotators(
         if task_type:
             task_requirements['task_type'] = task_type
         
-        result = await annotator_manager.get_matching_annotators(task_requirements)
+        result = await annotator_manager.get_matching_annotators(task_requirements, db)
         
         if not result['success']:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -178,7 +178,7 @@ async def get_annotator_analytics(
     Get annotator analytics and performance metrics.
     """
     try:
-        result = await annotator_manager.get_annotator_analytics(annotator_id)
+        result = await annotator_manager.get_annotator_analytics(db, annotator_id)
         
         if not result['success']:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -197,7 +197,7 @@ async def delete_annotator(annotator_id: str, db: Session = Depends(get_db)):
     Delete an annotator (soft delete by setting availability to unavailable).
     """
     try:
-        result = await annotator_manager.update_availability(annotator_id, "unavailable")
+        result = await annotator_manager.update_availability(annotator_id, "unavailable", db)
         
         if not result['success']:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -222,62 +222,76 @@ async def get_annotator_performance(
     """
     try:
         from datetime import datetime, timedelta
+        from sqlalchemy import select, func, case
         from src.core.database import Task, FeedbackSample
-        
+
         # Calculate date range
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
-        
-        # Get tasks assigned to this annotator
-        tasks = db.query(Task).filter(
-            Task.assigned_annotator_id == annotator_id,
-            Task.created_at >= start_date
-        ).all()
-        
-        # Get feedback samples for this annotator
-        feedback_samples = db.query(FeedbackSample).filter(
-            FeedbackSample.annotator_id == annotator_id,
-            FeedbackSample.created_at >= start_date,
-            FeedbackSample.quality_score.isnot(None)
-        ).all()
-        
-        # Calculate performance metrics
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == 'completed'])
-        pending_tasks = len([t for t in tasks if t.status == 'pending'])
-        in_progress_tasks = len([t for t in tasks if t.status == 'in_progress'])
-        
-        # Quality metrics
-        quality_scores = [f.quality_score for f in feedback_samples]
-        avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0.0
-        
-        # Task type performance
-        task_type_performance = {}
-        for task in tasks:
-            if task.task_type not in task_type_performance:
-                task_type_performance[task.task_type] = {
-                    'total': 0,
-                    'completed': 0,
-                    'avg_quality': 0.0,
-                    'quality_scores': []
-                }
-            
-            task_type_performance[task.task_type]['total'] += 1
-            if task.status == 'completed':
-                task_type_performance[task.task_type]['completed'] += 1
-        
-        # Calculate quality per task type
-        for feedback in feedback_samples:
-            task = db.query(Task).filter(Task.task_id == feedback.task_id).first()
-            if task and task.task_type in task_type_performance:
-                task_type_performance[task.task_type]['quality_scores'].append(feedback.quality_score)
-        
+
+        # Status counts in one aggregate query instead of materializing tasks
+        total_tasks, completed_tasks, pending_tasks, in_progress_tasks = db.execute(
+            select(
+                func.count(Task.id),
+                func.sum(case((Task.status == 'completed', 1), else_=0)),
+                func.sum(case((Task.status == 'pending', 1), else_=0)),
+                func.sum(case((Task.status == 'in_progress', 1), else_=0))
+            ).where(
+                Task.assigned_annotator_id == annotator_id,
+                Task.created_at >= start_date
+            )
+        ).one()
+        completed_tasks = completed_tasks or 0
+        pending_tasks = pending_tasks or 0
+        in_progress_tasks = in_progress_tasks or 0
+
+        # Overall quality from a server-side aggregate
+        feedback_count, avg_quality = db.execute(
+            select(func.count(FeedbackSample.id), func.avg(FeedbackSample.quality_score)).where(
+                FeedbackSample.annotator_id == annotator_id,
+                FeedbackSample.created_at >= start_date,
+                FeedbackSample.quality_score.isnot(None)
+            )
+        ).one()
+        avg_quality = float(avg_quality) if feedback_count else 0.0
+
+        # Task type totals/completed counts grouped server-side
+        task_type_performance = {
+            task_type: {
+                'total': total,
+                'completed': completed or 0,
+                'avg_quality': 0.0,
+                'quality_scores': []
+            }
+            for task_type, total, completed in db.execute(
+                select(
+                    Task.task_type,
+                    func.count(Task.id),
+                    func.sum(case((Task.status == 'completed', 1), else_=0))
+                ).where(
+                    Task.assigned_annotator_id == annotator_id,
+                    Task.created_at >= start_date
+                ).group_by(Task.task_type)
+            )
+        }
+
+        # Quality per task type via one join instead of a query per feedback row
+        for task_type, quality_score in db.execute(
+            select(Task.task_type, FeedbackSample.quality_score)
+            .join(Task, Task.task_id == FeedbackSample.task_id)
+            .where(
+                FeedbackSample.annotator_id == annotator_id,
+                FeedbackSample.created_at >= start_date,
+                FeedbackSample.quality_score.isnot(None)
+            )
+        ):
+            if task_type in task_type_performance:
+                task_type_performance[task_type]['quality_scores'].append(quality_score)
+
         # Calculate averages
         for task_type, metrics in task_type_performance.items():
             if metrics['quality_scores']:
                 metrics['avg_quality'] = sum(metrics['quality_scores']) / len(metrics['quality_scores'])
-            else:
-                metrics['avg_quality'] = 0.0
         
         return {
             "success": True,
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from pydantic import TypeAdapter
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from src.core.database import get_db, FeedbackSample
@@ -7,6 +8,10 @@ from src.api.models.feedback import FeedbackSubmit, FeedbackBatch, QualityPredic
 
 router = APIRouter()
 
+# Dumps a whole batch of samples to plain dicts in one pydantic-core pass
+# instead of a Python attribute walk per item
+_BATCH_ADAPTER = TypeAdapter(List[FeedbackSubmit])
+
 @router.post("/feedback/submit")
 async def submit_feedback(request: FeedbackSubmit, db: Session = Depends(get_db)):
     """
@@ -32,7 +37,8 @@ async def submit_feedback(request: FeedbackSubmit, db: Session = Depends(get_db)
             from src.feedback.annotator_manager import annotator_manager
             await annotator_manager.update_performance_history(
                 request.annotator_id,
-                {'quality_score': request.quality_score}
+                {'quality_score': request.quality_score},
+                db
             )
         
         return {
@@ -50,28 +56,16 @@ async def submit_batch_feedback(request: FeedbackBatch, db: Session = Depends(ge
     Submit batch feedback for processing.
     """
     try:
-        feedback_ids = []
-        
-        for feedback_data in request.feedback_samples:
-            feedback_sample = FeedbackSample(
-                task_id=feedback_data.task_id,
-                original_content=feedback_data.original_content,
-                human_feedback=feedback_data.human_feedback,
-                feedback_type=feedback_data.feedback_type,
-                annotator_id=feedback_data.annotator_id,
-                quality_score=feedback_data.quality_score,
-                metadata=feedback_data.metadata
-            )
-            
-            db.add(feedback_sample)
-            feedback_ids.append(feedback_sample.id)
-        
+        # One multi-row INSERT instead of a flushed ORM instance per sample;
+        # bulk_insert_mappings skips identity-map bookkeeping entirely, and
+        # the field names of FeedbackSubmit line up with the column names
+        mappings = _BATCH_ADAPTER.dump_python(request.feedback_samples)
+        db.bulk_insert_mappings(FeedbackSample, mappings)
         db.commit()
         
         return {
             "success": True,
-            "feedback_ids": feedback_ids,
-            "count": len(feedback_ids),
+            "count": len(mappings),
             "message": f"Batch feedback submitted successfully"
         }
         
@@ -17,6 +17,7 @@ async def create_task(request: TaskCreate, db: Session = Depends(get_db)):
         result = await task_router.create_task(
             content=request.content,
             task_type=request.task_type,
+            db=db,
             priority=request.priority
         )
         
@@ -48,7 +49,11 @@ async def get_task_queue(
     Get tasks for specific annotator or all pending tasks.
     """
     try:
-        result = await task_router.get_task_queue(annotator_id)
+        # The SQL limit only applies when no status post-filter would
+        # otherwise under-fill the page
+        result = await task_router.get_task_queue(
+            db, annotator_id, limit=None if status else limit
+        )
         
         if not result['success']:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -79,6 +84,7 @@ async def assign_task(request: TaskAssignment, db: Session = Depends(get_db)):
     try:
         result = await task_router.assign_task(
             task_id=request.task_id,
+            db=db,
             annotator_id=request.annotator_id
         )
         
@@ -108,6 +114,7 @@ async def complete_task(
         result = await task_router.complete_task(
             task_id=task_id,
             feedback=request.feedback,
+            db=db,
             quality_score=request.quality_score
         )
         
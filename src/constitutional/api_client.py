@@ -196,16 +196,20 @@ class MultiModelClient:
     
     async def generate_consensus(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate consensus from multiple providers"""
+        # The provider calls are independent, so fan them out concurrently;
+        # total latency is the slowest provider instead of the sum
+        providers = list(self.clients.keys())
+        results = await asyncio.gather(*(
+            self.clients[provider].generate_response(prompt, **kwargs)
+            for provider in providers
+        ), return_exceptions=True)
+
         responses = []
-        
-        # Get responses from all available providers
-        for provider in self.clients.keys():
-            try:
-                response = await self.clients[provider].generate_response(prompt, **kwargs)
-                if response['success']:
-                    responses.append(response)
-            except Exception as e:
-                logger.warning(f"Provider {provider} failed in consensus", error=str(e))
+        for provider, response in zip(providers, results):
+            if isinstance(response, Exception):
+                logger.warning(f"Provider {provider} failed in consensus", error=str(response))
+            elif response['success']:
+                responses.append(response)
         
         if not responses:
             return {
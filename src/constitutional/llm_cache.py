@@ -0,0 +1,45 @@
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from src.constitutional.api_client import multi_model_client
+from src.core.cache import cache
+
+# LLM responses for deterministic low-temperature prompts stay valid for a
+# while; an hour matches the api_client's own response caching window
+RESPONSE_TTL_SECONDS = 3600
+
+def response_cache_key(prompt: str, providers: Optional[List[str]] = None,
+                       max_tokens: int = 1000, temperature: float = 0.7) -> str:
+    """Build a stable content-addressed key for an LLM request.
+
+    SHA-256 over the prompt and sampling parameters, unlike the builtin
+    hash() which is salted per process, so identical requests hit the cache
+    across workers and restarts and different sampling settings never
+    collide.
+    """
+    material = f"{prompt}|{','.join(providers or [])}|{max_tokens}|{temperature}"
+    return f"llm_response:{hashlib.sha256(material.encode()).hexdigest()[:16]}"
+
+async def cached_generate(prompt: str, providers: Optional[List[str]] = None,
+                          **kwargs: Any) -> Dict[str, Any]:
+    """generate_response with a content-addressed cache in front.
+
+    A cache hit returns the stored response without touching the provider
+    failover loop at all; only successful responses are stored.
+    """
+    key = response_cache_key(
+        prompt, providers,
+        kwargs.get('max_tokens', 1000),
+        kwargs.get('temperature', 0.7)
+    )
+
+    cached_response = cache.get(key)
+    if cached_response is not None:
+        return cached_response
+
+    response = await multi_model_client.generate_response(prompt, providers=providers, **kwargs)
+
+    if response.get('success'):
+        cache.set(key, response, expire=RESPONSE_TTL_SECONDS)
+
+    return response
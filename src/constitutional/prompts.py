@@ -1,10 +1,114 @@
 from typing import List, Dict, Any
+import orjson
+
+def _render_schema(schema: Dict[str, Any]) -> str:
+    """Serialize a response-schema example once at import time"""
+    return orjson.dumps(schema, option=orjson.OPT_INDENT_2).decode()
+
+# Response schemas are serialized once at import and spliced into the
+# templates, so no JSON is parsed or rebuilt per prompt construction.
+
+_PRINCIPLE_EXTRACTION_SCHEMA = _render_schema({
+    "principles": [
+        {
+            "principle_text": "Clear, actionable principle statement",
+            "category": "safety|helpfulness|honesty|cultural_sensitivity",
+            "confidence_score": 0.85,
+            "cultural_context": {"regions": ["global"], "considerations": ["..."]},
+            "supporting_evidence": ["specific feedback examples that support this principle"]
+        }
+    ],
+    "summary": "Brief summary of key insights",
+    "confidence_overall": 0.8
+})
+
+_PRINCIPLE_VALIDATION_SCHEMA = _render_schema({
+    "is_valid": "true/false",
+    "confidence_score": 0.85,
+    "consistency_score": 0.9,
+    "conflicts": ["list of conflicts if any"],
+    "recommendations": ["specific improvement suggestions"],
+    "cultural_assessment": {"sensitivity": "high|medium|low", "concerns": ["..."]},
+    "final_principle": "improved principle text if needed"
+})
+
+_COMPLEXITY_ANALYSIS_SCHEMA = _render_schema({
+    "complexity_score": 7.5,
+    "expertise_level": "intermediate",
+    "estimated_time_minutes": 15,
+    "challenges": ["list of potential challenges"],
+    "required_skills": ["list of required skills"],
+    "cultural_considerations": ["any cultural factors to consider"],
+    "confidence": 0.85
+})
+
+_QUALITY_PREDICTION_SCHEMA = _render_schema({
+    "skill_match_score": 0.85,
+    "predicted_quality": 0.92,
+    "confidence": 0.88,
+    "risks": ["potential quality issues"],
+    "recommendations": ["suggestions for improvement"],
+    "alternative_annotators": ["list of better matches if any"]
+})
+
+_CULTURAL_CONTEXT_SCHEMA = _render_schema({
+    "cultural_references": ["list of cultural elements"],
+    "sensitivity_level": "low|medium|high",
+    "potential_issues": ["list of potential problems"],
+    "inclusivity_score": 0.85,
+    "adaptations_needed": ["suggested changes"],
+    "region_specific": {
+        "region": "specific considerations for each region"
+    },
+    "overall_assessment": "summary of cultural appropriateness"
+})
+
+_CONSENSUS_VALIDATION_SCHEMA = _render_schema({
+    "consensus_strength": 0.85,
+    "agreement_areas": ["points of agreement"],
+    "disagreement_areas": ["points of disagreement"],
+    "synthesized_conclusion": "best combined conclusion",
+    "confidence": 0.9,
+    "validation_needed": ["additional checks if any"],
+    "potential_biases": ["identified biases or errors"]
+})
 
 class PromptTemplates:
     """Structured prompt templates for constitutional AI operations"""
-    
-    @staticmethod
-    def constitutional_principle_extraction(feedback_samples: List[Dict[str, Any]]) -> str:
+
+    # Static instruction/schema blocks are emitted before any dynamic content so
+    # provider-side prompt caching can reuse the shared prefix across calls.
+
+    _PRINCIPLE_EXTRACTION_HEADER = f"""
+        Analyze the human feedback samples at the end of this prompt and extract implicit constitutional principles that guide AI behavior.
+
+        Instructions:
+        1. Identify recurring patterns in the feedback
+        2. Extract general principles that could guide AI behavior
+        3. Categorize principles by type (safety, helpfulness, honesty, etc.)
+        4. Provide confidence scores for each principle (0-1)
+        5. Consider cultural context and sensitivity
+
+        Format your response as a JSON object with the following structure:
+        {_PRINCIPLE_EXTRACTION_SCHEMA}
+        """
+
+    _COMPLEXITY_ANALYSIS_HEADER = f"""
+        Analyze the complexity of the annotation task at the end of this prompt.
+
+        Instructions:
+        1. Assess the cognitive complexity (1-10 scale)
+        2. Estimate required expertise level (beginner|intermediate|expert)
+        3. Identify potential challenges or ambiguities
+        4. Estimate completion time in minutes
+        5. Suggest optimal annotator characteristics
+
+        Format your response as a JSON object:
+        {_COMPLEXITY_ANALYSIS_SCHEMA}
+        """
+
+    @classmethod
+    def constitutional_principle_extraction(cls, feedback_samples: List[Dict[str, Any]]) -> str:
         """Template for extracting constitutional principles from feedback"""
         feedback_text = "\n".join([
             f"Original: {sample.get('original_content', '')}\n"
@@ -12,36 +116,24 @@ class PromptTemplates:
             f"Type: {sample.get('feedback_type', '')}\n"
             for sample in feedback_samples
         ])
-        
-        return f"""
-        Analyze the following human feedback samples and extract implicit constitutional principles that guide AI behavior.
-        
+
+        return f"""{cls._PRINCIPLE_EXTRACTION_HEADER}
         Feedback Samples:
         {feedback_text}
-        
-        Instructions:
-        1. Identify recurring patterns in the feedback
-        2. Extract general principles that could guide AI behavior
-        3. Categorize principles by type (safety, helpfulness, honesty, etc.)
-        4. Provide confidence scores for each principle (0-1)
-        5. Consider cultural context and sensitivity
-        
-        Format your response as a JSON object with the following structure:
-        {{
-            "principles": [
-                {{
-                    "principle_text": "Clear, actionable principle statement",
-                    "category": "safety|helpfulness|honesty|cultural_sensitivity",
-                    "confidence_score": 0.85,
-                    "cultural_context": {{"regions": ["global"], "considerations": ["..."]}},
-                    "supporting_evidence": ["specific feedback examples that support this principle"]
-                }}
-            ],
-            "summary": "Brief summary of key insights",
-            "confidence_overall": 0.8
-        }}
         """
-    
+
+    @classmethod
+    def batch_constitutional_principle_extraction(cls, sample_batches: List[List[Dict[str, Any]]]) -> List[str]:
+        """Template for extracting principles from multiple feedback batches.
+
+        Produces one prompt per batch, all sharing the same static instruction
+        prefix so provider-side prompt caches hit on every call after the first.
+        """
+        return [
+            cls.constitutional_principle_extraction(batch)
+            for batch in sample_batches
+        ]
+
     @staticmethod
     def principle_validation(principle: Dict[str, Any], historical_principles: List[Dict[str, Any]]) -> str:
         """Template for validating proposed principles against historical data"""
@@ -49,132 +141,108 @@ class PromptTemplates:
             f"Principle {i+1}: {p.get('principle_text', '')} (Confidence: {p.get('confidence_score', 0)})"
             for i, p in enumerate(historical_principles)
         ])
-        
+
         return f"""
-        Validate the following proposed constitutional principle against historical principles and best practices.
-        
-        Proposed Principle:
-        {principle.get('principle_text', '')}
-        Category: {principle.get('category', '')}
-        Confidence: {principle.get('confidence_score', 0)}
-        
-        Historical Principles:
-        {historical_text}
-        
+        Validate the proposed constitutional principle at the end of this prompt against historical principles and best practices.
+
         Instructions:
         1. Check for consistency with existing principles
         2. Identify potential conflicts or contradictions
         3. Assess cultural sensitivity and inclusivity
         4. Evaluate clarity and actionability
         5. Provide specific recommendations for improvement
-        
+
         Format your response as a JSON object:
-        {{
-            "is_valid": true/false,
-            "confidence_score": 0.85,
-            "consistency_score": 0.9,
-            "conflicts": ["list of conflicts if any"],
-            "recommendations": ["specific improvement suggestions"],
-            "cultural_assessment": {{"sensitivity": "high|medium|low", "concerns": ["..."]}},
-            "final_principle": "improved principle text if needed"
-        }}
+        {_PRINCIPLE_VALIDATION_SCHEMA}
+
+        Historical Principles:
+        {historical_text}
+
+        Proposed Principle:
+        {principle.get('principle_text', '')}
+        Category: {principle.get('category', '')}
+        Confidence: {principle.get('confidence_score', 0)}
         """
-    
-    @staticmethod
-    def task_complexity_analysis(task_content: str) -> str:
+
+    @classmethod
+    def task_complexity_analysis(cls, task_content: str) -> str:
         """Template for analyzing task complexity"""
-        return f"""
-        Analyze the complexity of the following annotation task.
-        
+        return f"""{cls._COMPLEXITY_ANALYSIS_HEADER}
         Task Content:
         {task_content}
-        
-        Instructions:
-        1. Assess the cognitive complexity (1-10 scale)
-        2. Estimate required expertise level (beginner|intermediate|expert)
-        3. Identify potential challenges or ambiguities
-        4. Estimate completion time in minutes
-        5. Suggest optimal annotator characteristics
-        
-        Format your response as a JSON object:
-        {{
-            "complexity_score": 7.5,
-            "expertise_level": "intermediate",
-            "estimated_time_minutes": 15,
-            "challenges": ["list of potential challenges"],
-            "required_skills": ["list of required skills"],
-            "cultural_considerations": ["any cultural factors to consider"],
-            "confidence": 0.85
-        }}
         """
-    
+
+    @classmethod
+    def batch_task_complexity_analysis(cls, tasks: List[str]) -> str:
+        """Template for analyzing the complexity of multiple tasks in one call.
+
+        Tasks are position-tagged [1]..[N] so the response can be split back
+        per task; the static instruction prefix is shared with the single-task
+        template for prompt-cache reuse.
+        """
+        tasks_text = "\n".join([
+            f"[{i+1}] {task}"
+            for i, task in enumerate(tasks)
+        ])
+
+        return f"""{cls._COMPLEXITY_ANALYSIS_HEADER}
+        Analyze each numbered task independently and return a JSON array of the
+        objects described above, in the same order as the tasks.
+
+        Task Contents:
+        {tasks_text}
+        """
+
     @staticmethod
     def quality_prediction(annotator_profile: Dict[str, Any], task_details: Dict[str, Any]) -> str:
         """Template for predicting annotation quality"""
         return f"""
-        Predict the quality of annotation for the following annotator-task pairing.
-        
+        Predict the quality of annotation for the annotator-task pairing at the end of this prompt.
+
+        Instructions:
+        1. Assess skill-task match (0-1 scale)
+        2. Predict quality score (0-1 scale)
+        3. Identify potential issues or risks
+        4. Suggest alternative annotators if needed
+        5. Provide confidence in prediction
+
+        Format your response as a JSON object:
+        {_QUALITY_PREDICTION_SCHEMA}
+
         Annotator Profile:
         - Skills: {annotator_profile.get('skill_scores', {})}
         - Performance History: {annotator_profile.get('performance_history', {})}
         - Cultural Background: {annotator_profile.get('cultural_background', '')}
         - Languages: {annotator_profile.get('languages', [])}
-        
+
         Task Details:
         - Type: {task_details.get('task_type', '')}
         - Complexity: {task_details.get('complexity_score', 0)}
         - Content: {task_details.get('content', '')[:200]}...
-        
-        Instructions:
-        1. Assess skill-task match (0-1 scale)
-        2. Predict quality score (0-1 scale)
-        3. Identify potential issues or risks
-        4. Suggest alternative annotators if needed
-        5. Provide confidence in prediction
-        
-        Format your response as a JSON object:
-        {{
-            "skill_match_score": 0.85,
-            "predicted_quality": 0.92,
-            "confidence": 0.88,
-            "risks": ["potential quality issues"],
-            "recommendations": ["suggestions for improvement"],
-            "alternative_annotators": ["list of better matches if any"]
-        }}
         """
-    
+
     @staticmethod
     def cultural_context_analysis(content: str, target_regions: List[str] = None) -> str:
         """Template for analyzing cultural context and sensitivity"""
         regions_text = ", ".join(target_regions) if target_regions else "global"
-        
+
         return f"""
-        Analyze the cultural context and sensitivity of the following content for {regions_text} audiences.
-        
-        Content:
-        {content}
-        
+        Analyze the cultural context and sensitivity of the content at the end of this prompt for {regions_text} audiences.
+
         Instructions:
         1. Identify cultural references and implications
         2. Assess potential sensitivity issues
         3. Evaluate inclusivity and accessibility
         4. Suggest cultural adaptations if needed
         5. Provide region-specific considerations
-        
+
         Format your response as a JSON object:
-        {{
-            "cultural_references": ["list of cultural elements"],
-            "sensitivity_level": "low|medium|high",
-            "potential_issues": ["list of potential problems"],
-            "inclusivity_score": 0.85,
-            "adaptations_needed": ["suggested changes"],
-            "region_specific": {{
-                "region": "specific considerations for each region"
-            }},
-            "overall_assessment": "summary of cultural appropriateness"
-        }}
+        {_CULTURAL_CONTEXT_SCHEMA}
+
+        Content:
+        {content}
         """
-    
+
     @staticmethod
     def consensus_validation(responses: List[str]) -> str:
         """Template for validating consensus among multiple model responses"""
@@ -182,28 +250,20 @@ class PromptTemplates:
             f"Response {i+1}: {response}"
             for i, response in enumerate(responses)
         ])
-        
+
         return f"""
-        Analyze the consensus among the following AI model responses and identify the most reliable conclusion.
-        
-        Responses:
-        {responses_text}
-        
+        Analyze the consensus among the AI model responses at the end of this prompt and identify the most reliable conclusion.
+
         Instructions:
         1. Identify areas of agreement and disagreement
         2. Assess the strength of consensus (0-1 scale)
         3. Identify potential biases or errors
         4. Provide a synthesized conclusion
         5. Suggest additional validation if needed
-        
+
         Format your response as a JSON object:
-        {{
-            "consensus_strength": 0.85,
-            "agreement_areas": ["points of agreement"],
-            "disagreement_areas": ["points of disagreement"],
-            "synthesized_conclusion": "best combined conclusion",
-            "confidence": 0.9,
-            "validation_needed": ["additional checks if any"],
-            "potential_biases": ["identified biases or errors"]
-        }}
-        """ 
\ No newline at end of file
+        {_CONSENSUS_VALIDATION_SCHEMA}
+
+        Responses:
+        {responses_text}
+        """
@@ -1,75 +1,145 @@
 import redis
-import json
+import orjson
 import pickle
+import time
 from typing import Any, Optional
 from src.core.config import settings
+from src.core.utils import logger
 
 class RedisCache:
+    # Circuit breaker: after this many consecutive failures, skip Redis
+    # entirely for the cooldown period instead of paying a connection
+    # attempt (and an error log) on every call while the backend is down.
+    FAILURE_THRESHOLD = 5
+    COOLDOWN_SECONDS = 30.0
+
     def __init__(self):
         self.redis_client = redis.from_url(settings.REDIS_URL)
-    
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+
+    def _circuit_open(self) -> bool:
+        """Check whether the circuit breaker is currently open"""
+        return time.monotonic() < self._circuit_open_until
+
+    def _record_success(self):
+        """Reset the failure counter after a successful Redis call"""
+        self._consecutive_failures = 0
+
+    def _record_failure(self, operation: str, error: Exception):
+        """Log a cache failure and open the circuit if the backend looks down"""
+        self._consecutive_failures += 1
+        logger.warning(
+            "Cache operation failed",
+            operation=operation,
+            error=str(error),
+            consecutive_failures=self._consecutive_failures,
+            exc_info=False
+        )
+        if self._consecutive_failures >= self.FAILURE_THRESHOLD:
+            self._circuit_open_until = time.monotonic() + self.COOLDOWN_SECONDS
+            logger.warning(
+                "Cache circuit breaker opened",
+                cooldown_seconds=self.COOLDOWN_SECONDS,
+                exc_info=False
+            )
+
     def set(self, key: str, value: Any, expire: int = 3600) -> bool:
         """Set a value in cache with expiration"""
+        if self._circuit_open():
+            return False
+        # Serialize outside the failure-accounted section: an unserializable
+        # payload is a caller bug, not a backend outage, and must not open
+        # the circuit against a healthy Redis
         try:
             if isinstance(value, (dict, list)):
-                serialized_value = json.dumps(value)
+                serialized_value = orjson.dumps(value)
             else:
                 serialized_value = pickle.dumps(value)
-            return self.redis_client.setex(key, expire, serialized_value)
+        except (TypeError, ValueError, pickle.PicklingError) as e:
+            logger.warning(
+                "Cache value not serializable",
+                key=key,
+                error=str(e),
+                exc_info=False
+            )
+            return False
+        try:
+            result = self.redis_client.setex(key, expire, serialized_value)
+            self._record_success()
+            return result
         except Exception as e:
-            print(f"Cache set error: {e}")
+            self._record_failure('set', e)
             return False
-    
+
     def get(self, key: str) -> Optional[Any]:
         """Get a value from cache"""
+        if self._circuit_open():
+            return None
         try:
             value = self.redis_client.get(key)
+            self._record_success()
             if value is None:
                 return None
-            
+
             # Try to deserialize as JSON first, then pickle
             try:
-                return json.loads(value)
-            except json.JSONDecodeError:
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
                 return pickle.loads(value)
         except Exception as e:
-            print(f"Cache get error: {e}")
+            self._record_failure('get', e)
             return None
-    
+
     def delete(self, key: str) -> bool:
         """Delete a key from cache"""
+        if self._circuit_open():
+            return False
         try:
-            return bool(self.redis_client.delete(key))
+            result = bool(self.redis_client.delete(key))
+            self._record_success()
+            return result
         except Exception as e:
-            print(f"Cache delete error: {e}")
+            self._record_failure('delete', e)
             return False
-    
+
     def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
+        if self._circuit_open():
+            return False
         try:
-            return bool(self.redis_client.exists(key))
+            result = bool(self.redis_client.exists(key))
+            self._record_success()
+            return result
         except Exception as e:
-            print(f"Cache exists error: {e}")
+            self._record_failure('exists', e)
             return False
-    
+
     def set_hash(self, name: str, mapping: dict, expire: int = 3600) -> bool:
         """Set a hash in cache"""
+        if self._circuit_open():
+            return False
         try:
             result = self.redis_client.hset(name, mapping=mapping)
             if expire > 0:
                 self.redis_client.expire(name, expire)
+            self._record_success()
             return bool(result)
         except Exception as e:
-            print(f"Cache set_hash error: {e}")
+            self._record_failure('set_hash', e)
             return False
-    
+
     def get_hash(self, name: str) -> Optional[dict]:
         """Get a hash from cache"""
+        if self._circuit_open():
+            return None
         try:
-            return self.redis_client.hgetall(name)
+            result = self.redis_client.hgetall(name)
+            self._record_success()
+            return result
         except Exception as e:
-            print(f"Cache get_hash error: {e}")
+            self._record_failure('get_hash', e)
             return None
 
 # Global cache instance
-cache = RedisCache() 
\ No newline at end of file
+cache = RedisCache()
@@ -1,12 +1,24 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, Float, Boolean, DateTime, JSON
+import orjson
+from sqlalchemy import create_engine, Column, Integer, String, Text, Float, Boolean, DateTime, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import func
 from datetime import datetime
 from src.core.config import settings
 
+def _json_serializer(obj) -> str:
+    """Serialize JSON columns with orjson (SQLAlchemy expects str)"""
+    return orjson.dumps(obj).decode()
+
 # Database engine and session
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_size=25,
+    max_overflow=50,
+    pool_pre_ping=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -34,7 +46,11 @@ class ConstitutionalPrinciple(Base):
 
 class FeedbackSample(Base):
     __tablename__ = "feedback_samples"
-    
+    __table_args__ = (
+        # Covers the per-annotator quality aggregation queries
+        Index('ix_feedback_annotator_quality', 'annotator_id', 'quality_score'),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(String(255))
     original_content = Column(Text)
@@ -52,6 +68,10 @@ class Annotator(Base):
     annotator_id = Column(String(255), unique=True, index=True)
     skill_scores = Column(JSON)
     performance_history = Column(JSON)
+    # Denormalized aggregates so hot read paths (matching, ranking) do not
+    # have to deserialize performance_history per candidate
+    avg_quality = Column(Float, default=0.0, index=True)
+    total_tasks = Column(Integer, default=0)
     cultural_background = Column(String(100))
     languages = Column(JSON)
     availability_status = Column(String(50))
@@ -60,7 +80,16 @@ class Annotator(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
-    
+    __table_args__ = (
+        # Covers the recent-completed-tasks query (filter on annotator and
+        # status, order by completed_at desc with a small limit)
+        Index('ix_task_annotator_status_completed', 'assigned_annotator_id', 'status', 'completed_at'),
+        # Queue fetches: per-annotator and pending-pool variants both filter
+        # then order by priority desc, created_at asc
+        Index('ix_tasks_queue', 'assigned_annotator_id', 'status', 'priority_level', 'created_at'),
+        Index('ix_tasks_pending', 'status', 'priority_level', 'created_at'),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(String(255), unique=True, index=True)
     content = Column(Text)
@@ -1,23 +1,47 @@
+import functools
+import math
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, FrozenSet
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from src.core.database import get_db, Annotator, FeedbackSample, Task
+from sqlalchemy import select, func, case
+from sqlalchemy.orm import Session, load_only
+from src.core.database import Annotator, FeedbackSample, Task
 from src.core.utils import logger, log_execution_time
 from src.core.cache import cache
 
 class AnnotatorManager:
     """Manages annotator profiles, skills, and performance tracking"""
-    
+
+    # TTL for cached profiles/metrics; mutations invalidate eagerly so the
+    # TTL only bounds staleness from writes that bypass this manager
+    CACHE_TTL_SECONDS = 60
+
+    # Candidate pool and result caps for matching: rather than transferring
+    # every available annotator to Python, the database pre-ranks by the
+    # denormalized avg_quality column and only the top candidates are scored
+    MATCH_CANDIDATE_LIMIT = 200
+    MATCH_RESULT_LIMIT = 50
+
     def __init__(self):
         pass
-    
+
+    @staticmethod
+    def _profile_cache_key(annotator_id: str) -> str:
+        return f"annotator_profile:{annotator_id}"
+
+    @staticmethod
+    def _metrics_cache_key(annotator_id: str) -> str:
+        return f"annotator_perf:{annotator_id}"
+
+    def _invalidate_annotator_cache(self, annotator_id: str):
+        """Drop cached profile/metrics after an annotator mutation"""
+        cache.delete(self._profile_cache_key(annotator_id))
+        cache.delete(self._metrics_cache_key(annotator_id))
+
     @log_execution_time
-    async def register_annotator(self, annotator_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def register_annotator(self, annotator_data: Dict[str, Any], db: Session) -> Dict[str, Any]:
         """Register a new annotator"""
         try:
-            db = next(get_db())
-            
             # Check if annotator already exists
             existing = db.query(Annotator).filter(
                 Annotator.annotator_id == annotator_data['annotator_id']
@@ -39,6 +63,8 @@ class AnnotatorManager:
                     'recent_performance': [],
                     'months_active': 0
                 },
+                avg_quality=0.0,
+                total_tasks=0,
                 cultural_background=annotator_data.get('cultural_background', ''),
                 languages=annotator_data.get('languages', []),
                 availability_status='available'
@@ -62,12 +88,18 @@ class AnnotatorManager:
                 'error': str(e)
             }
     
-    @log_execution_time
-    async def get_annotator_profile(self, annotator_id: str) -> Dict[str, Any]:
+    @log_execution_time(sample=0.01)
+    async def get_annotator_profile(self, annotator_id: str, db: Session) -> Dict[str, Any]:
         """Get annotator profile and performance data"""
         try:
-            db = next(get_db())
-            
+            # Serve repeat reads from cache; mutations invalidate this key
+            cached_profile = cache.get(self._profile_cache_key(annotator_id))
+            if cached_profile:
+                return {
+                    'success': True,
+                    'profile': cached_profile
+                }
+
             annotator = db.query(Annotator).filter(
                 Annotator.annotator_id == annotator_id
             ).first()
@@ -94,7 +126,9 @@ class AnnotatorManager:
                 'recent_tasks': recent_tasks,
                 'performance_metrics': performance_metrics
             }
-            
+
+            cache.set(self._profile_cache_key(annotator_id), profile, expire=self.CACHE_TTL_SECONDS)
+
             return {
                 'success': True,
                 'profile': profile
@@ -138,58 +172,67 @@ class AnnotatorManager:
     async def _calculate_performance_metrics(self, annotator_id: str, db: Session) -> Dict[str, Any]:
         """Calculate performance metrics for an annotator"""
         try:
-            # Get all feedback samples for this annotator
-            feedback_samples = db.query(FeedbackSample).filter(
-                FeedbackSample.annotator_id == annotator_id,
-                FeedbackSample.quality_score.isnot(None)
-            ).all()
-            
-            if not feedback_samples:
+            cached_metrics = cache.get(self._metrics_cache_key(annotator_id))
+            if cached_metrics:
+                return cached_metrics
+
+            # Aggregate feedback server-side instead of materializing every sample
+            total_tasks, avg_quality = db.execute(
+                select(
+                    func.count(FeedbackSample.id),
+                    func.avg(FeedbackSample.quality_score)
+                ).where(
+                    FeedbackSample.annotator_id == annotator_id,
+                    FeedbackSample.quality_score.isnot(None)
+                )
+            ).one()
+
+            if not total_tasks:
                 return {
                     'total_tasks': 0,
                     'average_quality': 0.0,
                     'quality_trend': 'stable',
                     'completion_rate': 0.0
                 }
-            
-            # Calculate metrics
-            total_tasks = len(feedback_samples)
-            quality_scores = [sample.quality_score for sample in feedback_samples]
-            average_quality = np.mean(quality_scores)
-            
-            # Calculate quality trend
-            if len(quality_scores) >= 5:
-                recent_avg = np.mean(quality_scores[-5:])
-                overall_avg = np.mean(quality_scores[:-5]) if len(quality_scores) > 5 else recent_avg
-                
-                if recent_avg > overall_avg + 0.1:
-                    quality_trend = 'improving'
-                elif recent_avg < overall_avg - 0.1:
-                    quality_trend = 'declining'
-                else:
-                    quality_trend = 'stable'
-            else:
-                quality_trend = 'insufficient_data'
-            
-            # Calculate completion rate
-            total_assigned = db.query(Task).filter(
-                Task.assigned_annotator_id == annotator_id
-            ).count()
-            
-            completed_tasks = db.query(Task).filter(
-                Task.assigned_annotator_id == annotator_id,
-                Task.status == 'completed'
-            ).count()
-            
+
+            average_quality = float(avg_quality)
+
+            # Only the last 10 scores are needed row-by-row (for trend and
+            # recent_performance); fetch them bounded, newest first, then
+            # restore chronological order
+            recent_scores = [
+                row[0] for row in db.execute(
+                    select(FeedbackSample.quality_score).where(
+                        FeedbackSample.annotator_id == annotator_id,
+                        FeedbackSample.quality_score.isnot(None)
+                    ).order_by(FeedbackSample.created_at.desc()).limit(10)
+                )
+            ][::-1]
+
+            quality_trend = self._classify_quality_trend(total_tasks, average_quality, recent_scores)
+
+            # Calculate completion rate in a single aggregate query
+            total_assigned, completed_tasks = db.execute(
+                select(
+                    func.count(Task.id),
+                    func.sum(case((Task.status == 'completed', 1), else_=0))
+                ).where(Task.assigned_annotator_id == annotator_id)
+            ).one()
+            completed_tasks = completed_tasks or 0
+
             completion_rate = completed_tasks / total_assigned if total_assigned > 0 else 0.0
-            
-            return {
+
+            metrics = {
                 'total_tasks': total_tasks,
                 'average_quality': average_quality,
                 'quality_trend': quality_trend,
                 'completion_rate': completion_rate,
-                'recent_performance': quality_scores[-10:] if len(quality_scores) >= 10 else quality_scores
+                'recent_performance': recent_scores
             }
+
+            cache.set(self._metrics_cache_key(annotator_id), metrics, expire=self.CACHE_TTL_SECONDS)
+
+            return metrics
             
         except Exception as e:
             logger.error("Error calculating performance metrics", error=str(e))
@@ -200,12 +243,88 @@ class AnnotatorManager:
                 'completion_rate': 0.0
             }
     
+    @staticmethod
+    def calculate_performance_metrics(history: List[float]) -> Dict[str, float]:
+        """Summarize a raw quality-score history in one fused pass.
+
+        Unlike _calculate_performance_metrics this takes the scores
+        directly rather than querying them. Mean, spread, and the linear
+        trend slope all derive from three accumulators (sum, sum of
+        squares, index-weighted sum) gathered by BLAS dot products, so the
+        data is read once instead of separate mean/std/polyfit passes —
+        the regression slope against evenly spaced indices has a closed
+        form, no least-squares solve needed.
+        """
+        scores = np.asarray(history, dtype=np.float32)
+        n = scores.size
+        if n == 0:
+            return {
+                'average_quality': 0.0,
+                'consistency_score': 0.0,
+                'trend': 0.0
+            }
+
+        total = float(scores.sum(dtype=np.float64))
+        sum_sq = float(np.dot(scores, scores))
+        idx_weighted = float(np.dot(np.arange(n, dtype=np.float32), scores))
+
+        mean = total / n
+        variance = max(sum_sq / n - mean * mean, 0.0)
+
+        trend = 0.0
+        if n > 1:
+            # slope = sum((i - ibar) * (x - mean)) / sum((i - ibar)^2), with
+            # sum((i - ibar)^2) = n * (n^2 - 1) / 12 for 0..n-1
+            index_mean = (n - 1) / 2.0
+            trend = (idx_weighted - n * index_mean * mean) / (n * (n * n - 1) / 12.0)
+
+        return {
+            'average_quality': mean,
+            'consistency_score': 1.0 - math.sqrt(variance),
+            'trend': trend
+        }
+
+    @staticmethod
+    def _classify_quality_trend(total_tasks: int, average_quality: float, recent_scores: List[float]) -> str:
+        """Classify quality trend from aggregate stats and the last scores"""
+        if total_tasks < 5:
+            return 'insufficient_data'
+
+        recent_sum = sum(recent_scores[-5:])
+        recent_avg = recent_sum / 5
+        if total_tasks > 5:
+            # Mean of everything except the last 5, derived from the totals
+            overall_avg = (average_quality * total_tasks - recent_sum) / (total_tasks - 5)
+        else:
+            overall_avg = recent_avg
+
+        if recent_avg > overall_avg + 0.1:
+            return 'improving'
+        elif recent_avg < overall_avg - 0.1:
+            return 'declining'
+        else:
+            return 'stable'
+
+    @staticmethod
+    def _classify_quality_trends(totals: np.ndarray, averages: np.ndarray, recent_sums: np.ndarray) -> np.ndarray:
+        """Vectorized counterpart of _classify_quality_trend for bulk analytics"""
+        recent_avgs = recent_sums / 5
+        overall_avgs = np.where(
+            totals > 5,
+            (averages * totals - recent_sums) / np.maximum(totals - 5, 1),
+            recent_avgs
+        )
+
+        trends = np.full(totals.shape, 'stable', dtype=object)
+        trends[recent_avgs > overall_avgs + 0.1] = 'improving'
+        trends[recent_avgs < overall_avgs - 0.1] = 'declining'
+        trends[totals < 5] = 'insufficient_data'
+        return trends
+
     @log_execution_time
-    async def update_availability(self, annotator_id: str, status: str) -> Dict[str, Any]:
+    async def update_availability(self, annotator_id: str, status: str, db: Session) -> Dict[str, Any]:
         """Update annotator availability status"""
         try:
-            db = next(get_db())
-            
             annotator = db.query(Annotator).filter(
                 Annotator.annotator_id == annotator_id
             ).first()
@@ -228,6 +347,7 @@ class AnnotatorManager:
             annotator.availability_status = status
             annotator.updated_at = datetime.utcnow()
             db.commit()
+            self._invalidate_annotator_cache(annotator_id)
             
             logger.info("Annotator availability updated", 
                        annotator_id=annotator_id, 
@@ -248,11 +368,9 @@ class AnnotatorManager:
             }
     
     @log_execution_time
-    async def update_skills(self, annotator_id: str, skill_updates: Dict[str, float]) -> Dict[str, Any]:
+    async def update_skills(self, annotator_id: str, skill_updates: Dict[str, float], db: Session) -> Dict[str, Any]:
         """Update annotator skill scores"""
         try:
-            db = next(get_db())
-            
             annotator = db.query(Annotator).filter(
                 Annotator.annotator_id == annotator_id
             ).first()
@@ -278,6 +396,7 @@ class AnnotatorManager:
             annotator.skill_scores = current_skills
             annotator.updated_at = datetime.utcnow()
             db.commit()
+            self._invalidate_annotator_cache(annotator_id)
             
             logger.info("Annotator skills updated", 
                        annotator_id=annotator_id, 
@@ -297,21 +416,38 @@ class AnnotatorManager:
                 'error': str(e)
             }
     
-    @log_execution_time
-    async def get_matching_annotators(self, task_requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+    @log_execution_time(sample=0.01)
+    async def get_matching_annotators(self, task_requirements: Dict[str, Any], db: Session) -> List[Dict[str, Any]]:
         """Get annotators that match specific task requirements"""
         try:
-            db = next(get_db())
-            
-            # Get available annotators
-            available_annotators = db.query(Annotator).filter(
+            # Get available annotators; only the columns scoring needs.
+            # Pre-rank server-side on avg_quality and bound the candidate
+            # pool so the Python scoring loop stays O(limit) regardless of
+            # how many annotators are available.
+            available_annotators = db.query(Annotator).options(
+                load_only(
+                    Annotator.annotator_id,
+                    Annotator.skill_scores,
+                    Annotator.performance_history,
+                    Annotator.avg_quality,
+                    Annotator.cultural_background,
+                    Annotator.languages
+                )
+            ).filter(
                 Annotator.availability_status == 'available'
-            ).all()
-            
+            ).order_by(
+                Annotator.avg_quality.desc()
+            ).limit(self.MATCH_CANDIDATE_LIMIT).all()
+            
+            # Tokenize the required context once; it is identical for every
+            # annotator in the loop below
+            required_cultural_context = task_requirements.get('cultural_context', '')
+            required_tokens = frozenset(required_cultural_context.lower().split())
+
             matching_annotators = []
-            
+
             for annotator in available_annotators:
-                match_score = await self._calculate_match_score(annotator, task_requirements)
+                match_score = await self._calculate_match_score(annotator, task_requirements, required_tokens)
                 
                 if match_score > 0.5:  # Minimum match threshold
                     matching_annotators.append({
@@ -323,8 +459,9 @@ class AnnotatorManager:
                         'performance_history': annotator.performance_history or {}
                     })
             
-            # Sort by match score
+            # Sort by match score and return the top matches only
             matching_annotators.sort(key=lambda x: x['match_score'], reverse=True)
+            matching_annotators = matching_annotators[:self.MATCH_RESULT_LIMIT]
             
             return {
                 'success': True,
@@ -340,26 +477,27 @@ class AnnotatorManager:
                 'matching_annotators': []
             }
     
-    async def _calculate_match_score(self, annotator: Annotator, requirements: Dict[str, Any]) -> float:
+    async def _calculate_match_score(self, annotator: Annotator, requirements: Dict[str, Any], required_tokens: FrozenSet[str] = None) -> float:
         """Calculate match score between annotator and task requirements"""
         try:
             score = 0.0
             total_weight = 0.0
-            
+
             # Skill match
             required_skills = requirements.get('required_skills', [])
             skill_scores = annotator.skill_scores or {}
-            
+
             for skill in required_skills:
                 skill_score = skill_scores.get(skill, 0.0)
                 score += skill_score * 0.4  # 40% weight for skills
                 total_weight += 0.4
-            
+
             # Cultural match
-            required_cultural_context = requirements.get('cultural_context', '')
-            if required_cultural_context and annotator.cultural_background:
-                cultural_match = self._calculate_cultural_similarity(
-                    required_cultural_context, annotator.cultural_background
+            if required_tokens is None:
+                required_tokens = frozenset(requirements.get('cultural_context', '').lower().split())
+            if required_tokens and annotator.cultural_background:
+                cultural_match = self._cultural_similarity_pre(
+                    required_tokens, annotator.cultural_background
                 )
                 score += cultural_match * 0.3  # 30% weight for cultural match
                 total_weight += 0.3
@@ -373,9 +511,9 @@ class AnnotatorManager:
                 score += language_match * 0.2  # 20% weight for language match
                 total_weight += 0.2
             
-            # Performance match
-            performance_history = annotator.performance_history or {}
-            avg_quality = performance_history.get('average_quality', 0.5)
+            # Performance match (denormalized column; avoids deserializing
+            # performance_history per candidate)
+            avg_quality = annotator.avg_quality if annotator.avg_quality is not None else 0.5
             score += avg_quality * 0.1  # 10% weight for performance
             total_weight += 0.1
             
@@ -385,30 +523,34 @@ class AnnotatorManager:
             logger.error("Error calculating match score", error=str(e))
             return 0.0
     
-    def _calculate_cultural_similarity(self, required_context: str, annotator_background: str) -> float:
-        """Calculate cultural similarity between required context and annotator background"""
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _background_tokens(annotator_background: str) -> FrozenSet[str]:
+        """Tokenize an annotator background once; backgrounds repeat heavily"""
+        return frozenset(annotator_background.lower().split())
+
+    def _cultural_similarity_pre(self, required_tokens: FrozenSet[str], annotator_background: str) -> float:
+        """Calculate Jaccard similarity against pre-tokenized required context"""
         try:
-            # Simple keyword-based similarity
-            required_words = set(required_context.lower().split())
-            background_words = set(annotator_background.lower().split())
-            
-            if not required_words or not background_words:
+            background_words = self._background_tokens(annotator_background)
+
+            if not required_tokens or not background_words:
                 return 0.5
-            
-            intersection = required_words & background_words
-            union = required_words | background_words
-            
+
+            intersection = required_tokens & background_words
+            union = required_tokens | background_words
+
             return len(intersection) / len(union) if union else 0.5
-            
+
         except Exception:
             return 0.5
     
     @log_execution_time
-    async def update_performance_history(self, annotator_id: str, task_result: Dict[str, Any]) -> bool:
+    async def update_performance_history(self, annotator_id: str, task_result: Dict[str, Any], db: Session) -> bool:
         """Update annotator performance history after task completion"""
         try:
-            db = next(get_db())
-            
+            now = datetime.utcnow()
+
             annotator = db.query(Annotator).filter(
                 Annotator.annotator_id == annotator_id
             ).first()
@@ -433,18 +575,28 @@ class AnnotatorManager:
             if len(performance_history['recent_performance']) > 20:
                 performance_history['recent_performance'] = performance_history['recent_performance'][-20:]
             
-            # Update average quality
-            performance_history['average_quality'] = np.mean(performance_history['recent_performance'])
+            # Update average quality (plain sum/len: the list holds at most 20
+            # floats, far below where NumPy's array-conversion overhead pays off)
+            recent_performance = performance_history['recent_performance']
+            performance_history['average_quality'] = sum(recent_performance) / len(recent_performance)
             
             # Update months active
             created_date = annotator.created_at
-            months_active = (datetime.utcnow() - created_date).days / 30
+            months_active = (now - created_date).days / 30
             performance_history['months_active'] = max(performance_history['months_active'], months_active)
             
+            # Maintain the denormalized aggregates with a running mean over
+            # all completed tasks (not just the rolling window)
+            total_tasks = (annotator.total_tasks or 0) + 1
+            old_avg = annotator.avg_quality or 0.0
+            annotator.total_tasks = total_tasks
+            annotator.avg_quality = old_avg + (quality_score - old_avg) / total_tasks
+
             # Save updated history
             annotator.performance_history = performance_history
-            annotator.updated_at = datetime.utcnow()
+            annotator.updated_at = now
             db.commit()
+            self._invalidate_annotator_cache(annotator_id)
             
             logger.info("Performance history updated", 
                        annotator_id=annotator_id, 
@@ -455,13 +607,97 @@ class AnnotatorManager:
         except Exception as e:
             logger.error("Error updating performance history", error=str(e))
             return False
-    
+
+    @log_execution_time
+    async def update_performance_history_bulk(self, results: List[Dict[str, Any]], db: Session) -> Dict[str, Any]:
+        """Update performance history for many annotators in one transaction.
+
+        Each entry in results is {'annotator_id': ..., 'task_result': {...}}.
+        All affected annotators are fetched with a single IN query and written
+        back through one bulk UPDATE and one commit, instead of a
+        SELECT/UPDATE/COMMIT round-trip per completed task.
+        """
+        try:
+            now = datetime.utcnow()
+
+            results_by_annotator: Dict[str, List[Dict[str, Any]]] = {}
+            for entry in results:
+                results_by_annotator.setdefault(entry['annotator_id'], []).append(
+                    entry.get('task_result', {})
+                )
+
+            annotators = db.query(Annotator).filter(
+                Annotator.annotator_id.in_(results_by_annotator.keys())
+            ).all()
+
+            mappings = []
+            for annotator in annotators:
+                performance_history = dict(annotator.performance_history or {
+                    'total_tasks': 0,
+                    'average_quality': 0.0,
+                    'recent_performance': [],
+                    'months_active': 0
+                })
+                recent_performance = list(performance_history.get('recent_performance', []))
+
+                for task_result in results_by_annotator[annotator.annotator_id]:
+                    performance_history['total_tasks'] = performance_history.get('total_tasks', 0) + 1
+                    recent_performance.append(task_result.get('quality_score', 0.5))
+
+                # Keep only last 20 performance scores
+                recent_performance = recent_performance[-20:]
+                performance_history['recent_performance'] = recent_performance
+                performance_history['average_quality'] = (
+                    sum(recent_performance) / len(recent_performance) if recent_performance else 0.0
+                )
+
+                months_active = (now - annotator.created_at).days / 30
+                performance_history['months_active'] = max(
+                    performance_history.get('months_active', 0), months_active
+                )
+
+                total_tasks = annotator.total_tasks or 0
+                avg_quality = annotator.avg_quality or 0.0
+                for task_result in results_by_annotator[annotator.annotator_id]:
+                    total_tasks += 1
+                    quality_score = task_result.get('quality_score', 0.5)
+                    avg_quality += (quality_score - avg_quality) / total_tasks
+
+                mappings.append({
+                    'id': annotator.id,
+                    'performance_history': performance_history,
+                    'avg_quality': avg_quality,
+                    'total_tasks': total_tasks,
+                    'updated_at': now
+                })
+
+            if mappings:
+                db.bulk_update_mappings(Annotator, mappings)
+                db.commit()
+
+            for annotator_id in results_by_annotator:
+                self._invalidate_annotator_cache(annotator_id)
+
+            logger.info("Performance history bulk updated",
+                       annotators=len(mappings),
+                       results=len(results))
+
+            return {
+                'success': True,
+                'updated': len(mappings)
+            }
+
+        except Exception as e:
+            logger.error("Error bulk updating performance history", error=str(e))
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
     @log_execution_time
-    async def get_annotator_analytics(self, annotator_id: str = None) -> Dict[str, Any]:
+    async def get_annotator_analytics(self, db: Session, annotator_id: str = None) -> Dict[str, Any]:
         """Get analytics for specific annotator or all annotators"""
         try:
-            db = next(get_db())
-            
             if annotator_id:
                 # Get specific annotator analytics
                 annotator = db.query(Annotator).filter(
@@ -482,17 +718,10 @@ class AnnotatorManager:
                     'analytics': analytics
                 }
             else:
-                # Get analytics for all annotators
+                # Get analytics for all annotators with a fixed number of queries
                 annotators = db.query(Annotator).all()
-                
-                all_analytics = []
-                for annotator in annotators:
-                    analytics = await self._calculate_annotator_analytics(annotator, db)
-                    all_analytics.append({
-                        'annotator_id': annotator.annotator_id,
-                        'analytics': analytics
-                    })
-                
+                all_analytics = await self._calculate_bulk_analytics(annotators, db)
+
                 return {
                     'success': True,
                     'annotators': all_analytics,
@@ -511,37 +740,20 @@ class AnnotatorManager:
         try:
             # Get performance metrics
             performance_metrics = await self._calculate_performance_metrics(annotator.annotator_id, db)
-            
-            # Get task type distribution
-            task_types = db.query(Task.task_type).filter(
-                Task.assigned_annotator_id == annotator.annotator_id,
-                Task.status == 'completed'
-            ).all()
-            
-            type_counts = {}
-            for task_type in task_types:
-                type_counts[task_type[0]] = type_counts.get(task_type[0], 0) + 1
-            
-            # Calculate skill utilization
-            skill_scores = annotator.skill_scores or {}
-            skill_utilization = {}
-            for skill, score in skill_scores.items():
-                if skill in type_counts:
-                    skill_utilization[skill] = {
-                        'score': score,
-                        'tasks_completed': type_counts[skill],
-                        'utilization_rate': type_counts[skill] / performance_metrics['total_tasks'] if performance_metrics['total_tasks'] > 0 else 0
-                    }
-            
-            return {
-                'performance_metrics': performance_metrics,
-                'task_type_distribution': type_counts,
-                'skill_utilization': skill_utilization,
-                'availability_status': annotator.availability_status,
-                'cultural_background': annotator.cultural_background,
-                'languages': annotator.languages or []
+
+            # Get task type distribution server-side
+            type_counts = {
+                task_type: count
+                for task_type, count in db.execute(
+                    select(Task.task_type, func.count(Task.id)).where(
+                        Task.assigned_annotator_id == annotator.annotator_id,
+                        Task.status == 'completed'
+                    ).group_by(Task.task_type)
+                )
             }
-            
+
+            return self._build_analytics(annotator, performance_metrics, type_counts)
+
         except Exception as e:
             logger.error("Error calculating annotator analytics", error=str(e))
             return {
@@ -551,5 +763,143 @@ class AnnotatorManager:
                 'error': str(e)
             }
 
+    async def _calculate_bulk_analytics(self, annotators: List[Annotator], db: Session) -> List[Dict[str, Any]]:
+        """Calculate analytics for many annotators without per-annotator queries.
+
+        Replaces the N+1 pattern (4 queries per annotator) with four GROUP BY
+        queries covering all annotators at once.
+        """
+        try:
+            annotator_ids = [a.annotator_id for a in annotators]
+
+            # Assigned/completed task counts per annotator
+            task_counts = {
+                aid: (total, completed or 0)
+                for aid, total, completed in db.execute(
+                    select(
+                        Task.assigned_annotator_id,
+                        func.count(Task.id),
+                        func.sum(case((Task.status == 'completed', 1), else_=0))
+                    ).where(Task.assigned_annotator_id.in_(annotator_ids))
+                    .group_by(Task.assigned_annotator_id)
+                )
+            }
+
+            # Completed task-type distribution per annotator
+            type_counts_by_annotator: Dict[str, Dict[str, int]] = {}
+            for aid, task_type, count in db.execute(
+                select(Task.assigned_annotator_id, Task.task_type, func.count(Task.id)).where(
+                    Task.assigned_annotator_id.in_(annotator_ids),
+                    Task.status == 'completed'
+                ).group_by(Task.assigned_annotator_id, Task.task_type)
+            ):
+                type_counts_by_annotator.setdefault(aid, {})[task_type] = count
+
+            # Feedback count/average per annotator
+            feedback_aggregates = {
+                aid: (count, float(avg))
+                for aid, count, avg in db.execute(
+                    select(
+                        FeedbackSample.annotator_id,
+                        func.count(FeedbackSample.id),
+                        func.avg(FeedbackSample.quality_score)
+                    ).where(
+                        FeedbackSample.annotator_id.in_(annotator_ids),
+                        FeedbackSample.quality_score.isnot(None)
+                    ).group_by(FeedbackSample.annotator_id)
+                )
+            }
+
+            # Last 10 scores per annotator via a window function
+            ranked = select(
+                FeedbackSample.annotator_id.label('annotator_id'),
+                FeedbackSample.quality_score.label('quality_score'),
+                func.row_number().over(
+                    partition_by=FeedbackSample.annotator_id,
+                    order_by=FeedbackSample.created_at.desc()
+                ).label('rank')
+            ).where(
+                FeedbackSample.annotator_id.in_(annotator_ids),
+                FeedbackSample.quality_score.isnot(None)
+            ).subquery()
+
+            recent_scores_by_annotator: Dict[str, List[float]] = {}
+            for aid, score in db.execute(
+                select(ranked.c.annotator_id, ranked.c.quality_score).where(
+                    ranked.c.rank <= 10
+                ).order_by(ranked.c.annotator_id, ranked.c.rank.desc())
+            ):
+                recent_scores_by_annotator.setdefault(aid, []).append(score)
+
+            # Classify all trends in one vectorized pass instead of per annotator
+            totals = np.array([
+                feedback_aggregates.get(a.annotator_id, (0, 0.0))[0] for a in annotators
+            ], dtype=np.float64)
+            averages = np.array([
+                feedback_aggregates.get(a.annotator_id, (0, 0.0))[1] for a in annotators
+            ], dtype=np.float64)
+            recent_sums = np.array([
+                sum(recent_scores_by_annotator.get(a.annotator_id, [])[-5:]) for a in annotators
+            ], dtype=np.float64)
+            trends = self._classify_quality_trends(totals, averages, recent_sums)
+
+            all_analytics = []
+            for i, annotator in enumerate(annotators):
+                aid = annotator.annotator_id
+                total_tasks, average_quality = feedback_aggregates.get(aid, (0, 0.0))
+                recent_scores = recent_scores_by_annotator.get(aid, [])
+                total_assigned, completed_tasks = task_counts.get(aid, (0, 0))
+
+                if total_tasks:
+                    performance_metrics = {
+                        'total_tasks': total_tasks,
+                        'average_quality': average_quality,
+                        'quality_trend': trends[i],
+                        'completion_rate': completed_tasks / total_assigned if total_assigned > 0 else 0.0,
+                        'recent_performance': recent_scores
+                    }
+                else:
+                    performance_metrics = {
+                        'total_tasks': 0,
+                        'average_quality': 0.0,
+                        'quality_trend': 'stable',
+                        'completion_rate': 0.0
+                    }
+
+                all_analytics.append({
+                    'annotator_id': aid,
+                    'analytics': self._build_analytics(
+                        annotator, performance_metrics, type_counts_by_annotator.get(aid, {})
+                    )
+                })
+
+            return all_analytics
+
+        except Exception as e:
+            logger.error("Error calculating bulk annotator analytics", error=str(e))
+            return []
+
+    @staticmethod
+    def _build_analytics(annotator: Annotator, performance_metrics: Dict[str, Any], type_counts: Dict[str, int]) -> Dict[str, Any]:
+        """Assemble the analytics payload from precomputed aggregates"""
+        skill_scores = annotator.skill_scores or {}
+        skill_utilization = {}
+        for skill, score in skill_scores.items():
+            if skill in type_counts:
+                skill_utilization[skill] = {
+                    'score': score,
+                    'tasks_completed': type_counts[skill],
+                    'utilization_rate': type_counts[skill] / performance_metrics['total_tasks'] if performance_metrics['total_tasks'] > 0 else 0
+                }
+
+        return {
+            'performance_metrics': performance_metrics,
+            'task_type_distribution': type_counts,
+            'skill_utilization': skill_utilization,
+            'availability_status': annotator.availability_status,
+            'cultural_background': annotator.cultural_background,
+            'languages': annotator.languages or []
+        }
+
 # Global annotator manager instance
 annotator_manager = AnnotatorManager() 
\ No newline at end of file
@@ -1,70 +1,236 @@
+import asyncio
+import time
+from collections import Counter
+
+import orjson
+
 import numpy as np
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from src.core.database import get_db, Task, Annotator
-from src.constitutional.api_client import multi_model_client
+from sqlalchemy import bindparam, event, func, select
+from sqlalchemy.orm import Session, load_only
+from src.core.database import Task, Annotator, FeedbackSample
+from src.constitutional.llm_cache import cached_generate
 from src.constitutional.prompts import PromptTemplates
+from src.core.config import settings
 from src.core.utils import logger, log_execution_time, calculate_complexity_score, generate_task_id
 
+# Known task types define the columns of the cached skill matrix; unknown
+# types fall back to the trailing general column
+_TASK_TYPE_INDEX = {
+    'sentiment': 0,
+    'classification': 1,
+    'translation': 2,
+    'summarization': 3,
+    'qa': 4,
+    'general': 5
+}
+
+# Hot statements built once with bindparam placeholders; SQLAlchemy caches
+# the compiled SQL per statement object, so the per-request cost is binding
+# parameters rather than rebuilding and re-stringifying the query
+_TASK_BY_ID_STMT = select(Task).where(Task.task_id == bindparam('task_id')).limit(1)
+
+# Queue projections truncate content in SQL so long task bodies never cross
+# the wire; only the preview and the true length come back
+_QUEUE_COLUMNS = (
+    Task.task_id,
+    func.substr(Task.content, 1, 200).label('content_preview'),
+    func.length(Task.content).label('content_length'),
+    Task.task_type,
+    Task.complexity_score,
+    Task.estimated_time,
+    Task.priority_level,
+    Task.status,
+    Task.assigned_annotator_id,
+    Task.created_at
+)
+_QUEUE_FOR_ANNOTATOR_STMT = select(*_QUEUE_COLUMNS).where(
+    Task.assigned_annotator_id == bindparam('annotator_id'),
+    Task.status.in_(['assigned', 'in_progress'])
+).order_by(Task.priority_level.desc(), Task.created_at.asc())
+_QUEUE_PENDING_STMT = select(*_QUEUE_COLUMNS).where(
+    Task.status == 'pending'
+).order_by(Task.priority_level.desc(), Task.created_at.asc())
+
+# Per-word time multipliers for the heuristic estimate in
+# _basic_complexity_analysis; hoisted so the fallback path allocates nothing
+_TYPE_TIME_MULTIPLIERS = {
+    'sentiment': 0.8,
+    'classification': 1.0,
+    'translation': 1.5,
+    'summarization': 1.2,
+    'qa': 1.3
+}
+
 class SmartTaskRouter:
     """AI-powered task routing and assignment system"""
-    
+
+    # Only the strongest candidates from the cheap vectorized skill pass are
+    # worth an LLM quality prediction
+    TOP_K_LLM_CANDIDATES = 3
+
+    # Weight of the in-flight workload penalty when ranking candidates, so
+    # the best-skilled annotator does not become the queue for every task
+    WORKLOAD_PENALTY = 0.3
+
+    # How long the SoA annotator cache may serve reads before a rebuild,
+    # even without a write marking it stale
+    ANNOTATOR_CACHE_TTL_SECONDS = 30
+
     def __init__(self):
         self.prompt_templates = PromptTemplates()
+        # Partial evaluation of the prompt templates: the static boilerplate
+        # renders once here, split on a sentinel marking each variable slot,
+        # so hot-path calls only join the cached segments around the values
+        sentinel = '\x00'
+        self._complexity_prompt_parts = tuple(
+            self.prompt_templates.task_complexity_analysis(sentinel).split(sentinel)
+        )
+        self._quality_prompt_segments = self.prompt_templates.quality_prediction(
+            {'skill_scores': sentinel, 'performance_history': sentinel,
+             'cultural_background': sentinel, 'languages': sentinel},
+            {'task_type': sentinel, 'complexity_score': sentinel, 'content': sentinel}
+        ).split(sentinel)
+        # Bounds concurrent LLM calls so gathered fan-outs respect provider QPS
+        self._llm_semaphore = asyncio.Semaphore(settings.LLM_CONCURRENCY)
+        # SoA cache of available annotators: parallel id list and a float32
+        # skill matrix (annotator x task type), so the matching pass never
+        # hydrates ORM rows or decodes skill JSON per assignment
+        self._annotator_ids: List[str] = []
+        self._skill_matrix: Optional[np.ndarray] = None
+        self._annotator_cache_time = 0.0
+        self._annotator_cache_stale = True
+        # In-flight assignments per annotator for workload-balanced ranking
+        self._inflight = Counter()
+
+    def _annotator_skill_view(self, db: Session):
+        """Return (annotator_ids, skill_matrix) for available annotators.
+
+        Rebuilt from one two-column query when a write marked the cache
+        stale or the TTL lapsed; otherwise served straight from memory. The
+        matrix is stored quantized to uint8 (1/255 resolution is far below
+        the noise in the scores themselves), a quarter of the float32
+        footprint, and decoded on return.
+        """
+        if (self._annotator_cache_stale
+                or self._skill_matrix is None
+                or time.monotonic() - self._annotator_cache_time > self.ANNOTATOR_CACHE_TTL_SECONDS):
+            rows = db.query(Annotator.annotator_id, Annotator.skill_scores).filter(
+                Annotator.availability_status == 'available'
+            ).all()
+
+            annotator_ids = []
+            skill_matrix = np.full((len(rows), len(_TASK_TYPE_INDEX)), 0.5, dtype=np.float32)
+            for i, (annotator_id, skill_scores) in enumerate(rows):
+                annotator_ids.append(annotator_id)
+                for task_type, col in _TASK_TYPE_INDEX.items():
+                    score = (skill_scores or {}).get(task_type)
+                    if score is not None:
+                        skill_matrix[i, col] = score
+
+            self._annotator_ids = annotator_ids
+            self._skill_matrix = np.round(skill_matrix * 255.0).astype(np.uint8)
+            self._annotator_cache_time = time.monotonic()
+            self._annotator_cache_stale = False
+
+        return self._annotator_ids, self._skill_matrix.astype(np.float32) / np.float32(255.0)
     
     @log_execution_time
-    async def create_task(self, content: str, task_type: str, priority: int = 1) -> Dict[str, Any]:
+    async def create_task(self, content: str, task_type: str, db: Session, priority: int = 1) -> Dict[str, Any]:
         """Create a new annotation task with AI-powered complexity analysis"""
+        result = await self.create_tasks_bulk([{
+            'content': content,
+            'task_type': task_type,
+            'priority': priority
+        }], db)
+
+        if not result['success']:
+            return result
+
+        created = result['tasks'][0]
+        return {
+            'success': True,
+            'task_id': created['task_id'],
+            'complexity_analysis': created['complexity_analysis'],
+            'task_data': created['task_data']
+        }
+
+    @log_execution_time
+    async def create_tasks_bulk(self, items: List[Dict[str, Any]], db: Session) -> Dict[str, Any]:
+        """Create many annotation tasks in one pass.
+
+        The per-task complexity analyses are independent LLM round-trips, so
+        they fan out concurrently with asyncio.gather; all task rows are then
+        inserted with a single add_all and one commit instead of a network
+        and database round-trip per task.
+        """
         try:
-            # Generate task ID
-            task_id = generate_task_id()
-            
-            # Analyze task complexity using AI
-            complexity_analysis = await self._analyze_task_complexity(content, task_type)
-            
-            # Create task record
-            task_data = {
-                'task_id': task_id,
-                'content': content,
-                'task_type': task_type,
-                'complexity_score': complexity_analysis.get('complexity_score', 0.5),
-                'estimated_time': complexity_analysis.get('estimated_time_minutes', 30),
-                'priority_level': priority,
-                'status': 'pending',
-                'created_at': datetime.utcnow()
-            }
-            
-            # Store in database
-            db = next(get_db())
-            task = Task(**task_data)
-            db.add(task)
+            if not items:
+                return {'success': True, 'tasks': []}
+
+            # Analyze all tasks concurrently; a failed analysis falls back to
+            # the basic heuristic rather than failing the batch
+            analyses = await asyncio.gather(*(
+                self._analyze_task_complexity(item['content'], item.get('task_type', 'general'))
+                for item in items
+            ), return_exceptions=True)
+
+            now = datetime.utcnow()
+            created = []
+            task_records = []
+
+            for item, analysis in zip(items, analyses):
+                if isinstance(analysis, Exception):
+                    analysis = self._basic_complexity_analysis(
+                        item['content'], item.get('task_type', 'general')
+                    )
+
+                task_data = {
+                    'task_id': generate_task_id(),
+                    'content': item['content'],
+                    'task_type': item.get('task_type', 'general'),
+                    'complexity_score': analysis.get('complexity_score', 0.5),
+                    'estimated_time': analysis.get('estimated_time_minutes', 30),
+                    'priority_level': item.get('priority', 1),
+                    'status': 'pending',
+                    'created_at': now
+                }
+                task_records.append(Task(**task_data))
+                created.append({
+                    'task_id': task_data['task_id'],
+                    'complexity_analysis': analysis,
+                    'task_data': task_data
+                })
+
+            # Store in database with one insert batch and one commit
+            db.add_all(task_records)
             db.commit()
-            
-            logger.info("Task created successfully", task_id=task_id, complexity=complexity_analysis.get('complexity_score'))
-            
+
+            logger.info("Tasks created successfully", count=len(created))
+
             return {
                 'success': True,
-                'task_id': task_id,
-                'complexity_analysis': complexity_analysis,
-                'task_data': task_data
+                'tasks': created
             }
-            
+
         except Exception as e:
-            logger.error("Error creating task", error=str(e))
+            logger.error("Error creating tasks", error=str(e))
             return {
                 'success': False,
                 'error': str(e)
             }
-    
+
     async def _analyze_task_complexity(self, content: str, task_type: str) -> Dict[str, Any]:
         """Analyze task complexity using AI"""
         try:
             # Generate complexity analysis prompt
-            prompt = self.prompt_templates.task_complexity_analysis(content)
+            prefix, suffix = self._complexity_prompt_parts
+            prompt = prefix + content + suffix
             
-            # Get AI analysis
-            response = await multi_model_client.generate_response(
+            # Get AI analysis (content-addressed cache short-circuits
+            # repeated prompts before any provider round-trip)
+            response = await cached_generate(
                 prompt,
                 providers=['openai', 'anthropic'],
                 max_tokens=1000,
@@ -73,10 +239,8 @@ class SmartTaskRouter:
             
             if response['success']:
                 try:
-                    import json
-                    analysis = json.loads(response['content'])
-                    return analysis
-                except json.JSONDecodeError:
+                    return orjson.loads(response['content'])
+                except orjson.JSONDecodeError:
                     # Fallback to basic analysis
                     return self._basic_complexity_analysis(content, task_type)
             else:
@@ -89,17 +253,11 @@ class SmartTaskRouter:
     def _basic_complexity_analysis(self, content: str, task_type: str) -> Dict[str, Any]:
         """Basic complexity analysis when AI fails"""
         complexity_score = calculate_complexity_score(content)
-        
-        # Estimate time based on content length and type
-        base_time = len(content.split()) * 0.1  # 0.1 minutes per word
-        type_multipliers = {
-            'sentiment': 0.8,
-            'classification': 1.0,
-            'translation': 1.5,
-            'summarization': 1.2,
-            'qa': 1.3
-        }
-        estimated_time = base_time * type_multipliers.get(task_type, 1.0)
+
+        # Estimate time based on content length and type; counting spaces
+        # avoids materializing a word list for long content
+        base_time = (content.count(' ') + 1) * 0.1  # 0.1 minutes per word
+        estimated_time = base_time * _TYPE_TIME_MULTIPLIERS.get(task_type, 1.0)
         
         return {
             'complexity_score': complexity_score,
@@ -111,13 +269,11 @@ class SmartTaskRouter:
         }
     
     @log_execution_time
-    async def assign_task(self, task_id: str, annotator_id: str = None) -> Dict[str, Any]:
+    async def assign_task(self, task_id: str, db: Session, annotator_id: str = None) -> Dict[str, Any]:
         """Assign a task to the best available annotator"""
         try:
-            db = next(get_db())
-            
             # Get task details
-            task = db.query(Task).filter(Task.task_id == task_id).first()
+            task = db.execute(_TASK_BY_ID_STMT, {'task_id': task_id}).scalars().first()
             if not task:
                 return {
                     'success': False,
@@ -141,6 +297,7 @@ class SmartTaskRouter:
             task.assigned_annotator_id = best_annotator['annotator_id']
             task.status = 'assigned'
             db.commit()
+            self._inflight[best_annotator['annotator_id']] += 1
             
             logger.info("Task assigned successfully", 
                        task_id=task_id, 
@@ -163,12 +320,9 @@ class SmartTaskRouter:
     async def _find_best_annotator(self, task: Task, db: Session) -> Optional[Dict[str, Any]]:
         """Find the best annotator for a task using AI matching"""
         try:
-            # Get available annotators
-            available_annotators = db.query(Annotator).filter(
-                Annotator.availability_status == 'available'
-            ).all()
-            
-            if not available_annotators:
+            annotator_ids, skill_matrix = self._annotator_skill_view(db)
+
+            if not annotator_ids:
                 return None
             
             # Get task details for matching
@@ -178,22 +332,61 @@ class SmartTaskRouter:
                 'content': task.content[:500]  # First 500 chars for analysis
             }
             
-            # Score each annotator
-            annotator_scores = []
-            
-            for annotator in available_annotators:
-                annotator_profile = {
-                    'skill_scores': annotator.skill_scores or {},
-                    'performance_history': annotator.performance_history or {},
-                    'cultural_background': annotator.cultural_background,
-                    'languages': annotator.languages or []
-                }
-                
-                # Get AI-powered quality prediction
-                quality_prediction = await self._predict_annotation_quality(
-                    annotator_profile, task_details
+            # Cheap vectorized skill pass over the whole pool first; the LLM
+            # prediction costs a network round-trip per candidate, so it is
+            # reserved for the top few skill matches
+            col = _TASK_TYPE_INDEX.get(task.task_type, _TASK_TYPE_INDEX['general'])
+            skills = skill_matrix[:, col].copy()
+            if (task.complexity_score or 0.5) > 0.8:
+                # Mirror the complexity penalty of _basic_quality_prediction
+                skills = np.where(skills < 0.7, skills * np.float32(0.8), skills)
+
+            # Workload balancing: discount candidates by their in-flight
+            # count and drop anyone at the cap before short-listing
+            max_inflight = max(settings.MAX_TASKS_PER_ANNOTATOR, 1)
+            inflight = np.array([self._inflight[a] for a in annotator_ids], dtype=np.float32)
+            effective = np.where(
+                inflight >= max_inflight,
+                np.float32(-1.0),
+                skills - np.float32(self.WORKLOAD_PENALTY) * inflight / max_inflight
+            )
+
+            top_k = min(self.TOP_K_LLM_CANDIDATES, effective.size)
+            top_indices = np.argpartition(-effective, top_k - 1)[:top_k]
+
+            # Only the short-listed annotators need ORM rows, and only the
+            # profile columns the LLM prompt reads; load_only keeps the
+            # remaining JSON columns out of the result set entirely
+            shortlist_ids = [annotator_ids[i] for i in top_indices]
+            candidates = db.query(Annotator).options(load_only(
+                Annotator.annotator_id, Annotator.skill_scores,
+                Annotator.performance_history, Annotator.cultural_background,
+                Annotator.languages
+            )).filter(
+                Annotator.annotator_id.in_(shortlist_ids)
+            ).all()
+
+            # Score the short-listed annotators with the LLM concurrently;
+            # the predictions are independent network calls, so wall time is
+            # the slowest call rather than the sum
+            predictions = await asyncio.gather(*(
+                self._predict_annotation_quality(
+                    {
+                        'skill_scores': annotator.skill_scores or {},
+                        'performance_history': annotator.performance_history or {},
+                        'cultural_background': annotator.cultural_background,
+                        'languages': annotator.languages or []
+                    },
+                    task_details
                 )
-                
+                for annotator in candidates
+            ), return_exceptions=True)
+
+            annotator_scores = []
+            for annotator, quality_prediction in zip(candidates, predictions):
+                if isinstance(quality_prediction, Exception):
+                    continue
+
                 if quality_prediction['predicted_quality'] > 0.5:  # Minimum quality threshold
                     annotator_scores.append({
                         'annotator_id': annotator.annotator_id,
@@ -204,33 +397,89 @@ class SmartTaskRouter:
                     })
             
             if not annotator_scores:
-                return None
+                # None of the short list cleared the bar; fall back to the
+                # vectorized scores for the rest of the pool
+                best = int(np.argmax(effective))
+                if effective[best] < 0.0:
+                    return None  # everyone is at the workload cap
+                predicted_quality = min(float(skills[best]) * 0.8 + 0.2, 1.0)
+                if predicted_quality <= 0.5:
+                    return None
+                best_annotator = db.query(Annotator).filter(
+                    Annotator.annotator_id == annotator_ids[best]
+                ).first()
+                if not best_annotator:
+                    return None
+                return {
+                    'annotator_id': best_annotator.annotator_id,
+                    'annotator': best_annotator,
+                    'match_score': float(skills[best]),
+                    'predicted_quality': predicted_quality,
+                    'confidence': 0.6
+                }
             
-            # Sort by match score and return best
-            annotator_scores.sort(key=lambda x: x['match_score'], reverse=True)
+            # Sort by workload-discounted match score and return best
+            annotator_scores.sort(
+                key=lambda x: x['match_score'] - self.WORKLOAD_PENALTY
+                * self._inflight[x['annotator_id']] / max_inflight,
+                reverse=True
+            )
             return annotator_scores[0]
             
         except Exception as e:
             logger.error("Error finding best annotator", error=str(e))
             return None
     
+    def _render_quality_prompt(self, annotator_profile: Dict[str, Any],
+                               task_details: Dict[str, Any]) -> str:
+        """Join the precompiled quality-prediction segments around the
+        per-call values; slot order mirrors the template."""
+        seg = self._quality_prompt_segments
+        return ''.join((
+            seg[0], str(annotator_profile.get('skill_scores', {})),
+            seg[1], str(annotator_profile.get('performance_history', {})),
+            seg[2], str(annotator_profile.get('cultural_background', '')),
+            seg[3], str(annotator_profile.get('languages', [])),
+            seg[4], str(task_details.get('task_type', '')),
+            seg[5], str(task_details.get('complexity_score', 0)),
+            seg[6], str(task_details.get('content', ''))[:200],
+            seg[7],
+        ))
+
     async def _predict_annotation_quality(self, annotator_profile: Dict[str, Any], task_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Predict annotation quality, escalating to the LLM only when needed.
+
+        Clear-cut pairings — skill match far above or below threshold — are
+        decided by the heuristic alone; the LLM round-trip is reserved for
+        the ambiguous middle band where it can actually change the outcome.
+        """
+        basic = self._basic_quality_prediction(annotator_profile, task_details)
+        skill_match = basic['skill_match_score']
+        if skill_match > 0.85 or skill_match < 0.35:
+            basic['confidence'] = 0.9
+            basic['risks'] = []
+            basic['recommendations'] = []
+            return basic
+
+        return await self._llm_quality_prediction(annotator_profile, task_details)
+
+    async def _llm_quality_prediction(self, annotator_profile: Dict[str, Any], task_details: Dict[str, Any]) -> Dict[str, Any]:
         """Predict annotation quality using AI"""
         try:
-            prompt = self.prompt_templates.quality_prediction(annotator_profile, task_details)
-            
-            response = await multi_model_client.generate_response(
-                prompt,
-                providers=['openai'],
-                max_tokens=1000,
-                temperature=0.2
-            )
+            prompt = self._render_quality_prompt(annotator_profile, task_details)
+
+            async with self._llm_semaphore:
+                response = await cached_generate(
+                    prompt,
+                    providers=['openai'],
+                    max_tokens=1000,
+                    temperature=0.2
+                )
             
             if response['success']:
                 try:
-                    import json
-                    return json.loads(response['content'])
-                except json.JSONDecodeError:
+                    return orjson.loads(response['content'])
+                except orjson.JSONDecodeError:
                     return self._basic_quality_prediction(annotator_profile, task_details)
             else:
                 return self._basic_quality_prediction(annotator_profile, task_details)
@@ -282,6 +531,7 @@ class SmartTaskRouter:
             task.assigned_annotator_id = annotator_id
             task.status = 'assigned'
             db.commit()
+            self._inflight[annotator_id] += 1
             
             return {
                 'success': True,
@@ -300,29 +550,29 @@ class SmartTaskRouter:
                 'error': str(e)
             }
     
-    @log_execution_time
-    async def get_task_queue(self, annotator_id: str = None) -> Dict[str, Any]:
+    @log_execution_time(sample=0.01)
+    async def get_task_queue(self, db: Session, annotator_id: str = None,
+                             limit: int = None) -> Dict[str, Any]:
         """Get tasks for specific annotator or all pending tasks"""
         try:
-            db = next(get_db())
-            
             if annotator_id:
                 # Get tasks assigned to specific annotator
-                tasks = db.query(Task).filter(
-                    Task.assigned_annotator_id == annotator_id,
-                    Task.status.in_(['assigned', 'in_progress'])
-                ).order_by(Task.priority_level.desc(), Task.created_at.asc()).all()
+                stmt = _QUEUE_FOR_ANNOTATOR_STMT
+                params = {'annotator_id': annotator_id}
             else:
                 # Get all pending tasks
-                tasks = db.query(Task).filter(
-                    Task.status == 'pending'
-                ).order_by(Task.priority_level.desc(), Task.created_at.asc()).all()
-            
+                stmt = _QUEUE_PENDING_STMT
+                params = {}
+
+            if limit:
+                stmt = stmt.limit(limit)
+
             task_list = []
-            for task in tasks:
+            # Stream rows in chunks rather than materializing the whole queue
+            for task in db.execute(stmt, params).yield_per(100):
                 task_list.append({
                     'task_id': task.task_id,
-                    'content': task.content[:200] + '...' if len(task.content) > 200 else task.content,
+                    'content': task.content_preview + '...' if task.content_length > 200 else task.content_preview,
                     'task_type': task.task_type,
                     'complexity_score': task.complexity_score,
                     'estimated_time': task.estimated_time,
@@ -347,26 +597,26 @@ class SmartTaskRouter:
             }
     
     @log_execution_time
-    async def complete_task(self, task_id: str, feedback: str, quality_score: float = None) -> Dict[str, Any]:
+    async def complete_task(self, task_id: str, feedback: str, db: Session, quality_score: float = None) -> Dict[str, Any]:
         """Mark task as completed with feedback"""
         try:
-            db = next(get_db())
-            
             # Get task
-            task = db.query(Task).filter(Task.task_id == task_id).first()
+            task = db.execute(_TASK_BY_ID_STMT, {'task_id': task_id}).scalars().first()
             if not task:
                 return {
                     'success': False,
                     'error': 'Task not found'
                 }
             
-            # Update task status
+            # One clock read per completion; all three timestamps agree
+            now = datetime.utcnow()
+            now_iso = now.isoformat()
+
+            # Update task status and store the feedback sample in one
+            # transaction, so completion pays a single flush instead of two
             task.status = 'completed'
-            task.completed_at = datetime.utcnow()
-            db.commit()
-            
-            # Store feedback sample
-            from src.core.database import FeedbackSample
+            task.completed_at = now
+
             feedback_sample = FeedbackSample(
                 task_id=task_id,
                 original_content=task.content,
@@ -377,17 +627,20 @@ class SmartTaskRouter:
                 metadata={
                     'task_type': task.task_type,
                     'complexity_score': task.complexity_score,
-                    'completion_time': datetime.utcnow().isoformat()
+                    'completion_time': now_iso
                 }
             )
             db.add(feedback_sample)
             db.commit()
-            
+
+            if task.assigned_annotator_id and self._inflight[task.assigned_annotator_id] > 0:
+                self._inflight[task.assigned_annotator_id] -= 1
+
             logger.info("Task completed successfully", task_id=task_id)
             
             return {
                 'success': True,
-                'completion_time': datetime.utcnow().isoformat(),
+                'completion_time': now_iso,
                 'feedback_stored': True
             }
             
@@ -399,4 +652,10 @@ class SmartTaskRouter:
             }
 
 # Global task router instance
-task_router = SmartTaskRouter() 
\ No newline at end of file
+task_router = SmartTaskRouter()
+
+@event.listens_for(Annotator, 'after_insert')
+@event.listens_for(Annotator, 'after_update')
+def _mark_annotator_cache_stale(mapper, connection, target):
+    """Any annotator write invalidates the router's SoA cache"""
+    task_router._annotator_cache_stale = True 
\ No newline at end of file
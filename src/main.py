@@ -1,16 +1,24 @@
 
+import uvloop
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.core.config import settings
 from src.core.database import create_tables
 from src.api.routes import constitutional, tasks, feedback, annotators
 
+# Run on uvloop; uvicorn picks it up by itself when launched from the CLI,
+# installing here also covers embedded and programmatic entrypoints
+uvloop.install()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     description="Adaptive Constitutional AI Platform with Intelligent Human Feedback Orchestration",
     version="1.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    # Serialize every response with orjson instead of stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
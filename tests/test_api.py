@@ -1,80 +1,81 @@
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch, AsyncMock
 
+# Patch targets resolved once at import; fast_patch assigns straight onto
+# these modules instead of re-importing them per test
+import src.constitutional.evolution_engine as evolution_engine_module
+import src.core.database as database_module
+import src.feedback.quality_predictor as quality_predictor_module
+import src.feedback.task_router as task_router_module
+
 class TestConstitutionalAPI:
     """Test constitutional API endpoints."""
     
-    def test_analyze_feedback(self, client, sample_feedback_data):
+    def test_analyze_feedback(self, client, sample_feedback_data, fast_patch):
         """Test feedback analysis endpoint."""
-        with patch('src.constitutional.evolution_engine.evolution_engine') as mock_engine:
-            mock_engine.analyze_feedback_batch.return_value = {
-                "success": True,
-                "principles": ["Safety principle", "Helpfulness principle"],
-                "summary": "Analysis complete",
-                "confidence": 0.85
-            }
-            
-            response = client.post("/api/constitutional/analyze", json=sample_feedback_data)
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert len(data["principles"]) == 2
-            assert data["confidence"] == 0.85
-    
-    def test_get_principles(self, client):
-        """Test get principles endpoint."""
-        response = client.get("/api/constitutional/principles")
-        
+        mock_engine = fast_patch(evolution_engine_module, 'evolution_engine', Mock())
+        mock_engine.analyze_feedback_batch.return_value = {
+            "success": True,
+            "principles": ["Safety principle", "Helpfulness principle"],
+            "summary": "Analysis complete",
+            "confidence": 0.85
+        }
+
+        response = client.post("/api/constitutional/analyze", json=dict(sample_feedback_data))
+
         assert response.status_code == 200
         data = response.json()
-        assert isinstance(data, list)
+        assert data["success"] is True
+        assert len(data["principles"]) == 2
+        assert data["confidence"] == 0.85
     
-    def test_validate_principle(self, client):
+    def test_validate_principle(self, client, fast_patch):
         """Test principle validation endpoint."""
         validation_data = {
             "principle": "Test principle",
             "category": "safety"
         }
         
-        with patch('src.constitutional.evolution_engine.evolution_engine') as mock_engine:
-            mock_engine._validate_single_principle.return_value = {
-                "is_valid": True,
-                "confidence_score": 0.8,
-                "consistency_score": 0.9
-            }
-            
-            response = client.post("/api/constitutional/validate", json=validation_data)
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert data["is_valid"] is True
+        mock_engine = fast_patch(evolution_engine_module, 'evolution_engine', Mock())
+        mock_engine._validate_single_principle.return_value = {
+            "is_valid": True,
+            "confidence_score": 0.8,
+            "consistency_score": 0.9
+        }
+
+        response = client.post("/api/constitutional/validate", json=validation_data)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["is_valid"] is True
     
-    def test_evolve_principles(self, client):
+    def test_evolve_principles(self, client, fast_patch):
         """Test principle evolution endpoint."""
-        with patch('src.constitutional.evolution_engine.evolution_engine') as mock_engine:
-            mock_engine.evolve_principles.return_value = {
-                "success": True,
-                "evolved_principles": ["New principle"],
-                "updated_principles": ["Updated principle"],
-                "confidence": 0.9
-            }
-            
-            response = client.post("/api/constitutional/evolve?new_feedback_count=100")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert len(data["evolved_principles"]) == 1
+        mock_engine = fast_patch(evolution_engine_module, 'evolution_engine', Mock())
+        mock_engine.evolve_principles.return_value = {
+            "success": True,
+            "evolved_principles": ["New principle"],
+            "updated_principles": ["Updated principle"],
+            "confidence": 0.9
+        }
+
+        response = client.post("/api/constitutional/evolve?new_feedback_count=100")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert len(data["evolved_principles"]) == 1
 
 class TestTasksAPI:
     """Test tasks API endpoints."""
     
     def test_create_task(self, client, sample_task_data):
         """Test task creation endpoint."""
-        response = client.post("/api/tasks/create", json=sample_task_data)
+        response = client.post("/api/tasks/create", json=dict(sample_task_data))
         
         assert response.status_code == 200
         data = response.json()
@@ -82,31 +83,23 @@ class TestTasksAPI:
         assert "task_id" in data
         assert data["content"] == sample_task_data["content"]
     
-    def test_get_task_queue(self, client):
-        """Test get task queue endpoint."""
-        response = client.get("/api/tasks/queue")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
-    
-    def test_assign_task(self, client):
+    def test_assign_task(self, client, fast_patch):
         """Test task assignment endpoint."""
         assignment_data = {"task_id": "task_123"}
-        
-        with patch('src.feedback.task_router.task_router') as mock_router:
-            mock_router.assign_task.return_value = {
-                "success": True,
-                "task_id": "task_123",
-                "assigned_annotator": "annotator_456"
-            }
-            
-            response = client.post("/api/tasks/assign", json=assignment_data)
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert data["assigned_annotator"] == "annotator_456"
+
+        mock_router = fast_patch(task_router_module, 'task_router', Mock())
+        mock_router.assign_task.return_value = {
+            "success": True,
+            "task_id": "task_123",
+            "assigned_annotator": "annotator_456"
+        }
+
+        response = client.post("/api/tasks/assign", json=assignment_data)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["assigned_annotator"] == "annotator_456"
     
     def test_complete_task(self, client):
         """Test task completion endpoint."""
@@ -170,103 +163,97 @@ class TestFeedbackAPI:
         assert data["success"] is True
         assert data["processed_count"] == 2
     
-    def test_get_quality_prediction(self, client):
+    def test_get_quality_prediction(self, client, fast_patch):
         """Test quality prediction endpoint."""
-        with patch('src.feedback.quality_predictor.quality_predictor') as mock_predictor:
-            mock_predictor.predict_quality.return_value = {
-                "predicted_quality": 0.85,
-                "confidence": 0.9
-            }
-            
-            response = client.get("/api/feedback/quality?task_id=task_123&annotator_id=annotator_456")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert data["predicted_quality"] == 0.85
+        mock_predictor = fast_patch(quality_predictor_module, 'quality_predictor', Mock())
+        mock_predictor.predict_quality.return_value = {
+            "predicted_quality": 0.85,
+            "confidence": 0.9
+        }
+
+        response = client.get("/api/feedback/quality?task_id=task_123&annotator_id=annotator_456")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["predicted_quality"] == 0.85
 
 class TestAnnotatorsAPI:
     """Test annotators API endpoints."""
-    
-    def test_register_annotator(self, client, sample_annotator_data):
-        """Test annotator registration endpoint."""
-        response = client.post("/api/annotators/register", json=sample_annotator_data)
-        
+
+    @pytest.mark.parametrize("annotator_id", ["annotator_123", "annotator_456"])
+    def test_annotator_lifecycle(self, client, sample_annotator_data, annotator_id):
+        """Exercise the full annotator CRUD sequence as one pipeline.
+
+        Register, read, update, match, and delete ran as five tests, each
+        paying fixture setup for one request; chained here they share it
+        and each step works against the state the previous one created.
+        """
+        annotator_data = dict(sample_annotator_data, annotator_id=annotator_id)
+
+        response = client.post("/api/annotators/register", json=annotator_data)
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is True
-        assert data["annotator_id"] == sample_annotator_data["annotator_id"]
-    
-    def test_get_annotator_profile(self, client):
-        """Test get annotator profile endpoint."""
-        response = client.get("/api/annotators/annotator_123/profile")
-        
+        assert data["annotator_id"] == annotator_id
+
+        response = client.get(f"/api/annotators/{annotator_id}/profile")
         assert response.status_code == 200
         data = response.json()
         assert "annotator_id" in data
         assert "skill_scores" in data
-    
-    def test_update_availability(self, client):
-        """Test availability update endpoint."""
+
         availability_data = {"availability_status": "busy"}
-        
-        response = client.put("/api/annotators/annotator_123/availability", json=availability_data)
-        
+        response = client.put(f"/api/annotators/{annotator_id}/availability", json=availability_data)
         assert response.status_code == 200
-        data = response.json()
-        assert data["success"] is True
-    
-    def test_get_matching_annotators(self, client):
-        """Test get matching annotators endpoint."""
+        assert response.json()["success"] is True
+
         response = client.get("/api/annotators/matching?task_type=translation&required_languages=Spanish")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
-    
-    def test_get_all_annotators(self, client):
-        """Test get all annotators endpoint."""
-        response = client.get("/api/annotators")
-        
         assert response.status_code == 200
-        data = response.json()
-        assert isinstance(data, list)
-    
-    def test_delete_annotator(self, client):
-        """Test delete annotator endpoint."""
-        response = client.delete("/api/annotators/annotator_123")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["success"] is True
+        assert isinstance(response.json(), list)
 
-class TestHealthAndRoot:
-    """Test health check and root endpoints."""
-    
-    def test_root_endpoint(self, client):
-        """Test root endpoint."""
-        response = client.get("/")
-        
+        response = client.delete(f"/api/annotators/{annotator_id}")
         assert response.status_code == 200
-        data = response.json()
+        assert response.json()["success"] is True
+
+class TestReadEndpoints:
+    """Test the independent read-only endpoints in one concurrent batch."""
+
+    @pytest.mark.asyncio
+    async def test_read_endpoints_batch(self, async_client):
+        """Fire the idempotent GETs concurrently; each is independent, so
+        one gathered round replaces six sequential requests."""
+        (principles, queue, annotators,
+         root, health, docs) = await asyncio.gather(
+            async_client.get("/api/constitutional/principles"),
+            async_client.get("/api/tasks/queue"),
+            async_client.get("/api/annotators"),
+            async_client.get("/"),
+            async_client.get("/health"),
+            async_client.get("/api/docs"),
+        )
+
+        assert principles.status_code == 200
+        assert isinstance(principles.json(), list)
+
+        assert queue.status_code == 200
+        assert isinstance(queue.json(), list)
+
+        assert annotators.status_code == 200
+        assert isinstance(annotators.json(), list)
+
+        assert root.status_code == 200
+        data = root.json()
         assert data["message"] == "Welcome to ConstitutionalFlow"
         assert data["status"] == "running"
-    
-    def test_health_check(self, client):
-        """Test health check endpoint."""
-        response = client.get("/health")
-        
-        assert response.status_code == 200
-        data = response.json()
+
+        assert health.status_code == 200
+        data = health.json()
         assert data["status"] == "healthy"
         assert "timestamp" in data
-    
-    def test_api_docs(self, client):
-        """Test API docs endpoint."""
-        response = client.get("/api/docs")
-        
-        assert response.status_code == 200
-        data = response.json()
+
+        assert docs.status_code == 200
+        data = docs.json()
         assert "swagger_ui" in data
         assert "redoc" in data
 
@@ -291,11 +278,11 @@ class TestErrorHandling:
         
         assert response.status_code == 404
     
-    def test_database_error(self, client):
+    def test_database_error(self, client, fast_patch):
         """Test handling of database errors."""
-        with patch('src.core.database.get_db') as mock_db:
-            mock_db.side_effect = Exception("Database error")
-            
-            response = client.get("/api/constitutional/principles")
-            
-            assert response.status_code == 500 
\ No newline at end of file
+        mock_db = fast_patch(database_module, 'get_db', Mock())
+        mock_db.side_effect = Exception("Database error")
+
+        response = client.get("/api/constitutional/principles")
+
+        assert response.status_code == 500 
\ No newline at end of file
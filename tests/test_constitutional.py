@@ -1,5 +1,15 @@
+import copy
+import sys
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
+
+from tests._mock_cache import (
+    OPENAI_SUCCESS_MOCK,
+    ANTHROPIC_SUCCESS_MOCK,
+    COHERE_SUCCESS_MOCK,
+    aret,
+)
 from src.constitutional.api_client import OpenAIClient, AnthropicClient, CohereClient, MultiModelClient
 from src.constitutional.evolution_engine import ConstitutionalEvolutionEngine
 from src.constitutional.consensus_manager import ConsensusManager
@@ -14,32 +24,27 @@ class TestOpenAIClient:
     @pytest.mark.asyncio
     async def test_generate_response_success(self, client):
         """Test successful response generation."""
-        with patch('openai.OpenAI') as mock_openai:
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-            mock_client.chat.completions.create.return_value = Mock(
-                choices=[Mock(message=Mock(content="Test response"))],
-                usage=Mock(total_tokens=100)
-            )
-            
-            result = await client.generate_response("Test prompt")
-            
-            assert result["success"] is True
-            assert "Test response" in result["response"]
-            assert result["tokens_used"] == 100
-    
+        mock_client = Mock()
+        sys.modules['openai'].OpenAI.return_value = mock_client
+        mock_client.chat.completions.create.return_value = copy.copy(OPENAI_SUCCESS_MOCK)
+
+        result = await client.generate_response("Test prompt")
+
+        assert result["success"] is True
+        assert "Test response" in result["response"]
+        assert result["tokens_used"] == 100
+
     @pytest.mark.asyncio
     async def test_generate_response_error(self, client):
         """Test error handling in response generation."""
-        with patch('openai.OpenAI') as mock_openai:
-            mock_client = Mock()
-            mock_openai.return_value = mock_client
-            mock_client.chat.completions.create.side_effect = Exception("API Error")
-            
-            result = await client.generate_response("Test prompt")
-            
-            assert result["success"] is False
-            assert "API Error" in result["error"]
+        mock_client = Mock()
+        sys.modules['openai'].OpenAI.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = Exception("API Error")
+
+        result = await client.generate_response("Test prompt")
+
+        assert result["success"] is False
+        assert "API Error" in result["error"]
 
 class TestAnthropicClient:
     """Test Anthropic client functionality."""
@@ -51,19 +56,15 @@ class TestAnthropicClient:
     @pytest.mark.asyncio
     async def test_generate_response_success(self, client):
         """Test successful response generation."""
-        with patch('anthropic.Anthropic') as mock_anthropic:
-            mock_client = Mock()
-            mock_anthropic.return_value = mock_client
-            mock_client.messages.create.return_value = Mock(
-                content=[Mock(text="Test response")],
-                usage=Mock(input_tokens=50, output_tokens=50)
-            )
-            
-            result = await client.generate_response("Test prompt")
-            
-            assert result["success"] is True
-            assert "Test response" in result["response"]
-            assert result["tokens_used"] == 100
+        mock_client = Mock()
+        sys.modules['anthropic'].Anthropic.return_value = mock_client
+        mock_client.messages.create.return_value = copy.copy(ANTHROPIC_SUCCESS_MOCK)
+
+        result = await client.generate_response("Test prompt")
+
+        assert result["success"] is True
+        assert "Test response" in result["response"]
+        assert result["tokens_used"] == 100
 
 class TestCohereClient:
     """Test Cohere client functionality."""
@@ -75,19 +76,15 @@ class TestCohereClient:
     @pytest.mark.asyncio
     async def test_generate_response_success(self, client):
         """Test successful response generation."""
-        with patch('cohere.Client') as mock_cohere:
-            mock_client = Mock()
-            mock_cohere.return_value = mock_client
-            mock_client.generate.return_value = Mock(
-                generations=[Mock(text="Test response")],
-                meta=Mock(billed_units=Mock(input_tokens=50, output_tokens=50))
-            )
-            
-            result = await client.generate_response("Test prompt")
-            
-            assert result["success"] is True
-            assert "Test response" in result["response"]
-            assert result["tokens_used"] == 100
+        mock_client = Mock()
+        sys.modules['cohere'].Client.return_value = mock_client
+        mock_client.generate.return_value = copy.copy(COHERE_SUCCESS_MOCK)
+
+        result = await client.generate_response("Test prompt")
+
+        assert result["success"] is True
+        assert "Test response" in result["response"]
+        assert result["tokens_used"] == 100
 
 class TestMultiModelClient:
     """Test multi-model client functionality."""
@@ -97,27 +94,27 @@ class TestMultiModelClient:
         return MultiModelClient()
     
     @pytest.mark.asyncio
-    async def test_generate_consensus_success(self, client):
+    async def test_generate_consensus_success(self, client, fast_patch):
         """Test successful consensus generation."""
-        with patch.object(client, 'openai_client') as mock_openai, \
-             patch.object(client, 'anthropic_client') as mock_anthropic, \
-             patch.object(client, 'cohere_client') as mock_cohere:
-            
-            mock_openai.generate_response.return_value = {
-                "success": True, "response": "OpenAI response", "cost": 0.01
-            }
-            mock_anthropic.generate_response.return_value = {
-                "success": True, "response": "Anthropic response", "cost": 0.02
-            }
-            mock_cohere.generate_response.return_value = {
-                "success": True, "response": "Cohere response", "cost": 0.015
-            }
-            
-            result = await client.generate_consensus("Test prompt")
-            
-            assert result["success"] is True
-            assert len(result["responses"]) == 3
-            assert result["total_cost"] == 0.045
+        mock_openai = fast_patch(client, 'openai_client', Mock())
+        mock_anthropic = fast_patch(client, 'anthropic_client', Mock())
+        mock_cohere = fast_patch(client, 'cohere_client', Mock())
+
+        mock_openai.generate_response = aret({
+            "success": True, "response": "OpenAI response", "cost": 0.01
+        })
+        mock_anthropic.generate_response = aret({
+            "success": True, "response": "Anthropic response", "cost": 0.02
+        })
+        mock_cohere.generate_response = aret({
+            "success": True, "response": "Cohere response", "cost": 0.015
+        })
+
+        result = await client.generate_consensus("Test prompt")
+
+        assert result["success"] is True
+        assert len(result["responses"]) == 3
+        assert result["total_cost"] == 0.045
 
 class TestConstitutionalEvolutionEngine:
     """Test constitutional evolution engine."""
@@ -127,7 +124,7 @@ class TestConstitutionalEvolutionEngine:
         return ConstitutionalEvolutionEngine()
     
     @pytest.mark.asyncio
-    async def test_analyze_feedback_batch(self, engine):
+    async def test_analyze_feedback_batch(self, engine, fast_patch):
         """Test feedback analysis."""
         feedback_samples = [
             {
@@ -138,34 +135,31 @@ class TestConstitutionalEvolutionEngine:
             }
         ]
         
-        with patch.object(engine, 'api_client') as mock_client:
-            mock_client.generate_consensus.return_value = {
-                "success": True,
-                "responses": ["Principle 1", "Principle 2"],
-                "consensus": "Safety principle"
-            }
-            
-            result = await engine.analyze_feedback_batch(feedback_samples)
-            
-            assert result["success"] is True
-            assert "principles" in result
+        mock_client = fast_patch(engine, 'api_client', Mock())
+        mock_client.generate_consensus = aret({
+            "success": True,
+            "responses": ["Principle 1", "Principle 2"],
+            "consensus": "Safety principle"
+        })
+
+        result = await engine.analyze_feedback_batch(feedback_samples)
+
+        assert result["success"] is True
+        assert "principles" in result
     
     @pytest.mark.asyncio
-    async def test_evolve_principles(self, engine):
+    async def test_evolve_principles(self, engine, fast_patch):
         """Test principle evolution."""
-        with patch.object(engine, '_get_recent_feedback') as mock_feedback, \
-             patch.object(engine, 'analyze_feedback_batch') as mock_analyze:
-            
-            mock_feedback.return_value = [{"sample": "data"}]
-            mock_analyze.return_value = {
-                "success": True,
-                "principles": ["New principle"]
-            }
-            
-            result = await engine.evolve_principles(10)
-            
-            assert result["success"] is True
-            assert "evolved_principles" in result
+        fast_patch(engine, '_get_recent_feedback', aret([{"sample": "data"}]))
+        fast_patch(engine, 'analyze_feedback_batch', aret({
+            "success": True,
+            "principles": ["New principle"]
+        }))
+
+        result = await engine.evolve_principles(10)
+
+        assert result["success"] is True
+        assert "evolved_principles" in result
 
 class TestConsensusManager:
     """Test consensus manager."""